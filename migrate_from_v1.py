@@ -7,35 +7,88 @@ import os
 import sys
 import sqlite3
 import shutil
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
-from datetime import datetime
-from typing import Dict, Any, List, Tuple, Optional
+from datetime import date, datetime
+from typing import Dict, Any, List, Tuple, Optional, Callable
 
 # Add src to path for imports
 sys.path.insert(0, str(Path(__file__).parent / "src"))
 
+from src.models import get_repository
 from src.models.base import get_database_manager, init_database
-from src.models.client import ClientRepository, ClientNoteRepository
-from src.models.diet import DietRepository, MealPlanRepository
 from src.config.settings import get_settings_manager
+from sqlalchemy import text
 from loguru import logger
 
 
+@lru_cache(maxsize=4096)
+def _parse_iso_date(date_str: str) -> Optional[str]:
+    """Parse a v1 YYYY-MM-DD date into ISO format; v1 dates repeat heavily, so results are cached"""
+    try:
+        return date.fromisoformat(date_str[:10]).isoformat()
+    except (TypeError, ValueError):
+        return None
+
+
+def _copy_file(source: Path, target: Path):
+    """Copy a file with its metadata like shutil.copy2, letting the kernel move the bytes where it can"""
+    try:
+        if not hasattr(os, "copy_file_range"):
+            raise OSError("copy_file_range is not available")
+
+        with open(source, "rb") as source_file, open(target, "wb") as target_file:
+            source_fd, target_fd = source_file.fileno(), target_file.fileno()
+            if hasattr(os, "posix_fadvise"):
+                os.posix_fadvise(source_fd, 0, 0, os.POSIX_FADV_SEQUENTIAL)
+
+            remaining = os.fstat(source_fd).st_size
+            while remaining > 0:
+                copied = os.copy_file_range(source_fd, target_fd, remaining)
+                if copied == 0:
+                    break
+                remaining -= copied
+
+    except OSError:
+        # Not Linux, or the filesystems can't copy_file_range; copyfile still uses sendfile where available
+        shutil.copyfile(source, target)
+
+    shutil.copystat(source, target)
+
+
 class V1ToV2Migrator:
     """Handles migration from v1.0 to v2.0 database schema"""
 
+    # v1 rows are streamed from the cursor and written in batches of this size
+    BATCH_SIZE = 5000
+
+    # v1 diet_info meal columns and the v2 meal plan fields they map onto;
+    # v1's two snacks become v2's morning and afternoon snacks
+    V1_MEAL_COLUMNS = ('breakfast', 'lunch', 'dinner', 'snack_1', 'snack_2')
+    V2_MEAL_FIELDS = ('breakfast', 'lunch', 'dinner', 'morning_snack', 'afternoon_snack')
+
     def __init__(self, v1_db_path: str, backup_dir: Optional[str] = None):
         self.v1_db_path = v1_db_path
         self.backup_dir = backup_dir or "migration_backups"
+        self._backup_path = Path(self.backup_dir)
         self.migration_log = []
         self.errors = []
 
-        # Initialize v2 components
+        # Initialize v2 components; the database manager and repositories are shared instances
         self.v2_db_manager = get_database_manager()
-        self.client_repo = ClientRepository()
-        self.diet_repo = DietRepository()
-        self.meal_repo = MealPlanRepository()
-        self.note_repo = ClientNoteRepository()
+        self.client_repo = get_repository("client")
+        self.diet_repo = get_repository("diet")
+        self.meal_repo = get_repository("meal_plan")
+        self.note_repo = get_repository("client_note")
+
+        # Diet records and notes migrate on parallel threads; v2 writes take turns
+        self._v2_write_lock = threading.Lock()
+
+        # v1 connection opened for the data migration, kept open for the validation counts
+        self._v1_conn: Optional[sqlite3.Connection] = None
 
     def run_migration(self) -> bool:
         """
@@ -59,8 +112,15 @@ class V1ToV2Migrator:
             if not self._initialize_v2_database():
                 return False
 
-            # Step 4: Migrate data
-            if not self._migrate_data():
+            # Step 4: Migrate data, rebuilding secondary indexes once afterwards
+            # instead of updating them on every insert
+            dropped_indexes = self._drop_indexes()
+            try:
+                migrated = self._migrate_data()
+            finally:
+                self._recreate_indexes(dropped_indexes)
+
+            if not migrated:
                 return False
 
             # Step 5: Validate migration
@@ -78,6 +138,11 @@ class V1ToV2Migrator:
             self.errors.append(f"Migration failed: {e}")
             return False
 
+        finally:
+            if self._v1_conn is not None:
+                self._v1_conn.close()
+                self._v1_conn = None
+
     def _validate_v1_database(self) -> bool:
         """Validate the v1 database exists and has expected structure"""
         try:
@@ -90,7 +155,7 @@ class V1ToV2Migrator:
 
             # Check for expected tables
             cursor.execute("SELECT name FROM sqlite_master WHERE type='table'")
-            tables = [row[0] for row in cursor.fetchall()]
+            tables = [row[0] for row in cursor]
 
             expected_tables = ['general_info', 'diet_info', 'notes']
             missing_tables = [table for table in expected_tables if table not in tables]
@@ -111,13 +176,13 @@ class V1ToV2Migrator:
     def _create_backup(self) -> bool:
         """Create backup of v1 database"""
         try:
-            backup_dir = Path(self.backup_dir)
+            backup_dir = self._backup_path
             backup_dir.mkdir(exist_ok=True)
 
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             backup_file = backup_dir / f"pharmacy_v1_backup_{timestamp}.db"
 
-            shutil.copy2(self.v1_db_path, backup_file)
+            _copy_file(Path(self.v1_db_path), backup_file)
 
             self.migration_log.append(f"Created backup: {backup_file}")
             logger.info(f"Backup created: {backup_file}")
@@ -139,28 +204,104 @@ class V1ToV2Migrator:
             self.errors.append(f"V2 database initialization failed: {e}")
             return False
 
-    def _migrate_data(self) -> bool:
-        """Migrate all data from v1 to v2"""
+    def _drop_indexes(self) -> List[Tuple[str, str]]:
+        """
+        Drop the non-unique v2 indexes ahead of the bulk load
+
+        Unique indexes are kept so the client upserts still find their conflicts.
+
+        Returns:
+            List of (name, CREATE INDEX statement) pairs for the dropped indexes
+        """
+        if not self.v2_db_manager.database_url.startswith("sqlite"):
+            return []
+
         try:
-            # Connect to v1 database
-            v1_conn = sqlite3.connect(self.v1_db_path)
-            v1_conn.row_factory = sqlite3.Row  # Access columns by name
+            with self.v2_db_manager.engine.begin() as connection:
+                rows = connection.execute(text(
+                    "SELECT name, sql FROM sqlite_master WHERE type='index' AND sql IS NOT NULL"
+                )).all()
+                indexes = [
+                    (name, sql) for name, sql in rows
+                    if not sql.lstrip().upper().startswith("CREATE UNIQUE")
+                ]
+                for name, _ in indexes:
+                    connection.execute(text(f'DROP INDEX IF EXISTS "{name}"'))
+
+            logger.info(f"Dropped {len(indexes)} v2 indexes for the bulk load")
+            return indexes
 
-            # Migrate in order: clients, diet records, notes
-            client_mapping = self._migrate_clients(v1_conn)
-            if not client_mapping:
-                return False
+        except Exception as e:
+            self.errors.append(f"Failed to drop v2 indexes: {e}")
+            return []
 
-            self._migrate_diet_records(v1_conn, client_mapping)
-            self._migrate_notes(v1_conn, client_mapping)
+    def _recreate_indexes(self, indexes: List[Tuple[str, str]]):
+        """Recreate the indexes dropped by _drop_indexes in a single transaction"""
+        if not indexes:
+            return
+
+        try:
+            started = time.perf_counter()
+            with self.v2_db_manager.engine.begin() as connection:
+                for _, sql in indexes:
+                    connection.execute(text(sql))
+
+            elapsed = time.perf_counter() - started
+            self.migration_log.append(f"Recreated {len(indexes)} indexes in {elapsed:.2f}s")
+            logger.info(f"Recreated {len(indexes)} v2 indexes in {elapsed:.2f}s")
+
+        except Exception as e:
+            self.errors.append(f"Failed to recreate v2 indexes: {e}")
+
+    def _migrate_data(self) -> bool:
+        """Migrate all data from v1 to v2"""
+        try:
+            # Connect to v1 database; run_migration closes it after validation
+            self._v1_conn = v1_conn = self._connect_v1()
+
+            # Migrate in order: clients, diet records, notes, on v2 connections tuned for bulk loading
+            with self.v2_db_manager.bulk_load():
+                client_mapping = self._migrate_clients(v1_conn)
+                if not client_mapping:
+                    return False
+
+                # Resolve v1 client ids to v2 ids once, instead of a pharmacy ID query per diet/note row
+                cursor = v1_conn.execute("SELECT id, client_pharmacy_id FROM general_info")
+                client_ids = {
+                    v1_client_id: client_mapping[pharmacy_id]
+                    for v1_client_id, pharmacy_id in cursor
+                    if pharmacy_id in client_mapping
+                }
+
+                # Diet records and notes fill different v2 tables, so both phases run at once,
+                # each reading v1 through its own connection
+                with ThreadPoolExecutor(max_workers=2) as executor:
+                    phases = [
+                        executor.submit(self._run_on_v1_connection, migrate_phase, client_ids)
+                        for migrate_phase in (self._migrate_diet_records, self._migrate_notes)
+                    ]
+                    for phase in phases:
+                        phase.result()
 
-            v1_conn.close()
             return True
 
         except Exception as e:
             self.errors.append(f"Data migration failed: {e}")
             return False
 
+    def _connect_v1(self) -> sqlite3.Connection:
+        """Open a connection to the v1 database; queries name their columns and rows stay plain tuples"""
+        return sqlite3.connect(self.v1_db_path)
+
+    def _run_on_v1_connection(self, migrate_phase: Callable[[sqlite3.Connection, Dict[int, int]], None],
+                              client_ids: Dict[int, int]):
+        """Run a migration phase on a v1 connection of its own; sqlite3 connections stay on one thread"""
+        v1_conn = self._connect_v1()
+        try:
+            migrate_phase(v1_conn, client_ids)
+        finally:
+            v1_conn.close()
+
     def _migrate_clients(self, v1_conn: sqlite3.Connection) -> Dict[str, int]:
         """
         Migrate client data from general_info table
@@ -168,42 +309,41 @@ class V1ToV2Migrator:
         Returns:
             Dict mapping v1 pharmacy_id to v2 client_id
         """
-        client_mapping = {}
-
         try:
+            # Explicit columns in a fixed order, so rows unpack positionally
             cursor = v1_conn.cursor()
-            cursor.execute("SELECT * FROM general_info")
-
-            migrated_count = 0
-            for row in cursor.fetchall():
-                try:
-                    # Map v1 fields to v2 structure
-                    client_data = {
-                        'client_pharmacy_id': row['client_pharmacy_id'],
-                        'client_name': row['client_name'],
-                        'age': row.get('age'),
-                        'job': row.get('job'),
-                        'address': row.get('address'),
-                        'phone': row.get('phone'),
-                        'work_effort': row.get('work_effort'),
-                        'diseases': row.get('diseases'),
-                        'previous_attempts': row.get('previous_attempts'),
-                        'current_treatment': row.get('current_treatment'),
-                        'visit_purpose': row.get('visit_purpose'),
-                        'follow_up_date': self._convert_date(row.get('follow_up_date'))
-                    }
-
-                    # Create client in v2
-                    client = self.client_repo.create_client(**client_data)
-                    if client:
-                        client_mapping[row['client_pharmacy_id']] = client.id
-                        migrated_count += 1
-                    else:
-                        self.errors.append(f"Failed to create client: {row['client_name']}")
-
-                except Exception as e:
-                    self.errors.append(f"Error migrating client {row.get('client_name', 'Unknown')}: {e}")
-
+            cursor.execute(
+                "SELECT client_pharmacy_id, client_name, age, job, address, phone, work_effort, diseases, "
+                "previous_attempts, current_treatment, visit_purpose, follow_up_date FROM general_info"
+            )
+
+            # Map v1 fields to v2 structure, writing one batch of clients at a time
+            client_mapping = {}
+            client_rows = []
+            for (pharmacy_id, client_name, age, job, address, phone, work_effort, diseases,
+                 previous_attempts, current_treatment, visit_purpose, follow_up_date) in cursor:
+                client_rows.append({
+                    'client_pharmacy_id': pharmacy_id,
+                    'client_name': client_name,
+                    'age': age,
+                    'job': job,
+                    'address': address,
+                    'phone': phone,
+                    'work_effort': work_effort,
+                    'diseases': diseases,
+                    'previous_attempts': previous_attempts,
+                    'current_treatment': current_treatment,
+                    'visit_purpose': visit_purpose,
+                    'follow_up_date': self._convert_date(follow_up_date)
+                })
+
+                if len(client_rows) >= self.BATCH_SIZE:
+                    self._write_client_batch(client_rows, client_mapping)
+                    client_rows = []
+
+            self._write_client_batch(client_rows, client_mapping)
+
+            migrated_count = len(client_mapping)
             self.migration_log.append(f"Migrated {migrated_count} clients")
             logger.info(f"Migrated {migrated_count} clients")
             return client_mapping
@@ -212,109 +352,192 @@ class V1ToV2Migrator:
             self.errors.append(f"Client migration failed: {e}")
             return {}
 
-    def _migrate_diet_records(self, v1_conn: sqlite3.Connection, client_mapping: Dict[str, int]):
-        """Migrate diet records from diet_info table"""
+    def _write_client_batch(self, client_rows: List[Dict[str, Any]], client_mapping: Dict[str, int]):
+        """Upsert a batch of mapped clients and record their v2 ids in client_mapping"""
+        if not client_rows:
+            return
+
+        # Keep the v1 pharmacy ID values as mapping keys; v2 stores them as text
+        v1_pharmacy_ids = [client_data['client_pharmacy_id'] for client_data in client_rows]
+        stored_ids = self.client_repo.bulk_upsert_clients(client_rows)
+        if not stored_ids and len(client_rows) > 1:
+            # The batch rolled back; retry row by row so one bad client only loses itself
+            for client_data in client_rows:
+                stored_ids.update(self.client_repo.bulk_upsert_clients([client_data]))
+
+        for v1_pharmacy_id, client_data in zip(v1_pharmacy_ids, client_rows):
+            client_id = stored_ids.get(str(client_data['client_pharmacy_id']))
+            if client_id:
+                client_mapping[v1_pharmacy_id] = client_id
+            else:
+                self.errors.append(f"Failed to create client: {client_data['client_name']}")
+
+    def _migrate_diet_records(self, v1_conn: sqlite3.Connection, client_ids: Dict[int, int]):
+        """Migrate diet records from diet_info table; client_ids maps v1 client ids to v2 ids"""
         try:
+            # Explicit columns in a fixed order, meal columns last, so rows unpack positionally
             cursor = v1_conn.cursor()
-            cursor.execute("SELECT * FROM diet_info")
+            cursor.execute(
+                "SELECT client_id, height, current_weight, previous_weight, fat_percentage, "
+                "muscle_percentage, water_percentage, mineral_percentage, bmi, weight_category, "
+                f"weight_condition, {', '.join(self.V1_MEAL_COLUMNS)} FROM diet_info"
+            )
 
             migrated_count = 0
-            for row in cursor.fetchall():
-                try:
-                    # Get v2 client_id from mapping
-                    v1_client_id = row['client_id']
-
-                    # Find corresponding pharmacy_id from general_info
-                    client_cursor = v1_conn.cursor()
-                    client_cursor.execute("SELECT client_pharmacy_id FROM general_info WHERE id = ?", (v1_client_id,))
-                    client_result = client_cursor.fetchone()
-
-                    if not client_result:
-                        continue
+            diet_rows = []
+            meal_rows = []  # meal plan data for each diet row, or None
+            for (v1_client_id, height, current_weight, previous_weight, fat_percentage,
+                 muscle_percentage, water_percentage, mineral_percentage, bmi, weight_category,
+                 weight_condition, *meal_values) in cursor:
+                # Get v2 client_id from the v1 client id
+                v2_client_id = client_ids.get(v1_client_id)
+
+                if not v2_client_id:
+                    continue
+
+                # Map diet data
+                diet_data = {
+                    'client_id': v2_client_id,
+                    'height': height,
+                    'current_weight': current_weight,
+                    'previous_weight': previous_weight,
+                    'fat_percentage': fat_percentage,
+                    'muscle_percentage': muscle_percentage,
+                    'water_percentage': water_percentage,
+                    'mineral_percentage': mineral_percentage,
+                    'bmi': bmi,
+                    'weight_category': weight_category,
+                    'weight_condition': weight_condition
+                }
+
+                # Only create meal plan if there's actual meal data; most rows have none,
+                # so the meal plan dict is built only after the values are checked
+                meal_data = None
+                if any(isinstance(meal, str) and meal.strip() for meal in meal_values):
+                    meal_data = dict(zip(self.V2_MEAL_FIELDS, meal_values))
+
+                diet_rows.append(diet_data)
+                meal_rows.append(meal_data)
+
+                if len(diet_rows) >= self.BATCH_SIZE:
+                    migrated_count += self._write_diet_batch(diet_rows, meal_rows)
+                    diet_rows, meal_rows = [], []
+
+            migrated_count += self._write_diet_batch(diet_rows, meal_rows)
 
-                    pharmacy_id = client_result['client_pharmacy_id']
-                    v2_client_id = client_mapping.get(pharmacy_id)
+            self.migration_log.append(f"Migrated {migrated_count} diet records")
+            logger.info(f"Migrated {migrated_count} diet records")
 
-                    if not v2_client_id:
-                        continue
+        except Exception as e:
+            self.errors.append(f"Diet records migration failed: {e}")
 
-                    # Map diet data
-                    diet_data = {
-                        'height': row.get('height'),
-                        'current_weight': row.get('current_weight'),
-                        'previous_weight': row.get('previous_weight'),
-                        'fat_percentage': row.get('fat_percentage'),
-                        'muscle_percentage': row.get('muscle_percentage'),
-                        'water_percentage': row.get('water_percentage'),
-                        'mineral_percentage': row.get('mineral_percentage'),
-                        'bmi': row.get('bmi'),
-                        'weight_category': row.get('weight_category'),
-                        'weight_condition': row.get('weight_condition')
-                    }
-
-                    # Create diet record
-                    diet_record = self.diet_repo.create_diet_record(v2_client_id, **diet_data)
-
-                    if diet_record:
-                        # Create meal plan if meal data exists
-                        meal_data = {
-                            'breakfast': row.get('breakfast'),
-                            'lunch': row.get('lunch'),
-                            'dinner': row.get('dinner'),
-                            'snack_1': row.get('snack_1'),
-                            'snack_2': row.get('snack_2')
-                        }
-
-                        # Only create meal plan if there's actual meal data
-                        if any(meal for meal in meal_data.values() if meal and meal.strip()):
-                            meal_plan = self.meal_repo.create_meal_plan(diet_record.id, **meal_data)
-
-                        migrated_count += 1
+    def _write_diet_batch(self, diet_rows: List[Dict[str, Any]], meal_rows: List[Optional[Dict[str, Any]]]) -> int:
+        """Insert a batch of diet records, then their meal plans; returns the number of diet records written"""
+        if not diet_rows:
+            return 0
+
+        with self._v2_write_lock:
+            diet_ids = self.diet_repo.bulk_create_diet_records(diet_rows)
+            if not diet_ids:
+                # The batch rolled back; retry row by row so one bad record only loses itself
+                written_meal_rows = []
+                for diet_data, meal_data in zip(diet_rows, meal_rows):
+                    record_ids = self.diet_repo.bulk_create_diet_records([diet_data])
+                    if record_ids:
+                        diet_ids.extend(record_ids)
+                        written_meal_rows.append(meal_data)
+                    else:
+                        self.errors.append(f"Failed to migrate a diet record for client {diet_data['client_id']}")
+                meal_rows = written_meal_rows
+
+            # Meal plans need the new diet record ids, so they go in as a second batch
+            meal_plans = [
+                dict(meal_data, diet_record_id=diet_id)
+                for diet_id, meal_data in zip(diet_ids, meal_rows)
+                if meal_data
+            ]
+            if meal_plans and not self.meal_repo.bulk_insert(meal_plans):
+                self.errors.append(f"Failed to migrate a batch of {len(meal_plans)} meal plans")
+
+        return len(diet_ids)
+
+    def _migrate_notes(self, v1_conn: sqlite3.Connection, client_ids: Dict[int, int]):
+        """Migrate notes from notes table; client_ids maps v1 client ids to v2 ids"""
+        if not self.v2_db_manager.database_url.startswith("sqlite"):
+            self._migrate_note_rows(v1_conn, client_ids)
+            return
 
-                except Exception as e:
-                    self.errors.append(f"Error migrating diet record: {e}")
+        try:
+            # Notes need no conversion, so SQLite copies them straight from the attached
+            # v1 database without the rows passing through Python
+            now = datetime.utcnow().isoformat(" ")
+            v2_conn = self.v2_db_manager.engine.raw_connection()
+            try:
+                # Match _migrate_note_rows: only clients migrated in this run, and str.strip() blank checks
+                v2_conn.create_function("has_text", 1, lambda text: bool(text and text.strip()), deterministic=True)
+                cursor = v2_conn.cursor()
+                cursor.execute("ATTACH DATABASE ? AS v1", (self.v1_db_path,))
+                try:
+                    with self._v2_write_lock:
+                        cursor.execute("BEGIN IMMEDIATE")
+                        try:
+                            cursor.execute(
+                                "CREATE TEMP TABLE migrated_client_ids (v1_id INTEGER PRIMARY KEY, v2_id INTEGER NOT NULL)"
+                            )
+                            cursor.executemany(
+                                "INSERT INTO migrated_client_ids (v1_id, v2_id) VALUES (?, ?)",
+                                client_ids.items()
+                            )
+                            cursor.execute(
+                                "INSERT INTO client_notes "
+                                "(client_id, title, content, note_type, is_private, created_at, updated_at, is_active) "
+                                "SELECT migrated_client_ids.v2_id, 'Migrated from v1.0', notes.client_notes, 'general', 0, ?, ?, 1 "
+                                "FROM v1.notes AS notes "
+                                "JOIN migrated_client_ids ON migrated_client_ids.v1_id = notes.client_id "
+                                "WHERE has_text(notes.client_notes)",
+                                (now, now)
+                            )
+                            migrated_count = cursor.rowcount
+                            cursor.execute("DROP TABLE migrated_client_ids")
+                            cursor.execute("COMMIT")
+                        except Exception:
+                            cursor.execute("ROLLBACK")
+                            raise
+                finally:
+                    cursor.execute("DETACH DATABASE v1")
+            finally:
+                v2_conn.close()
 
-            self.migration_log.append(f"Migrated {migrated_count} diet records")
-            logger.info(f"Migrated {migrated_count} diet records")
+            self.migration_log.append(f"Migrated {migrated_count} notes")
+            logger.info(f"Migrated {migrated_count} notes")
 
         except Exception as e:
-            self.errors.append(f"Diet records migration failed: {e}")
+            self.errors.append(f"Notes migration failed: {e}")
 
-    def _migrate_notes(self, v1_conn: sqlite3.Connection, client_mapping: Dict[str, int]):
-        """Migrate notes from notes table"""
+    def _migrate_note_rows(self, v1_conn: sqlite3.Connection, client_ids: Dict[int, int]):
+        """Migrate notes row by row through the repository, for v2 databases that cannot attach v1"""
         try:
             cursor = v1_conn.cursor()
-            cursor.execute("SELECT * FROM notes")
+            cursor.execute("SELECT client_id, client_notes FROM notes")
 
             migrated_count = 0
-            for row in cursor.fetchall():
+            for v1_client_id, note_content in cursor:
                 try:
-                    # Get v2 client_id from mapping
-                    v1_client_id = row['client_id']
-
-                    # Find corresponding pharmacy_id from general_info
-                    client_cursor = v1_conn.cursor()
-                    client_cursor.execute("SELECT client_pharmacy_id FROM general_info WHERE id = ?", (v1_client_id,))
-                    client_result = client_cursor.fetchone()
-
-                    if not client_result:
-                        continue
-
-                    pharmacy_id = client_result['client_pharmacy_id']
-                    v2_client_id = client_mapping.get(pharmacy_id)
+                    # Get v2 client_id from the v1 client id
+                    v2_client_id = client_ids.get(v1_client_id)
 
                     if not v2_client_id:
                         continue
 
                     # Create note
-                    note_content = row.get('client_notes', '')
                     if note_content and note_content.strip():
-                        note = self.note_repo.create_note(
-                            client_id=v2_client_id,
-                            content=note_content,
-                            title="Migrated from v1.0",
-                            note_type="general"
-                        )
+                        with self._v2_write_lock:
+                            note = self.note_repo.create_note(
+                                client_id=v2_client_id,
+                                content=note_content,
+                                title="Migrated from v1.0",
+                                note_type="general"
+                            )
 
                         if note:
                             migrated_count += 1
@@ -333,31 +556,18 @@ class V1ToV2Migrator:
         if not date_str:
             return None
 
-        try:
-            # Try to parse the date and return in ISO format
-            from datetime import datetime
-            dt = datetime.strptime(date_str, '%Y-%m-%d')
-            return dt.date().isoformat()
-        except:
-            return None
+        return _parse_iso_date(date_str)
 
     def _validate_migration(self) -> bool:
         """Validate that migration was successful"""
         try:
-            # Get counts from v1 database
-            v1_conn = sqlite3.connect(self.v1_db_path)
-            v1_cursor = v1_conn.cursor()
-
-            v1_cursor.execute("SELECT COUNT(*) FROM general_info")
-            v1_client_count = v1_cursor.fetchone()[0]
-
-            v1_cursor.execute("SELECT COUNT(*) FROM diet_info")
-            v1_diet_count = v1_cursor.fetchone()[0]
-
-            v1_cursor.execute("SELECT COUNT(*) FROM notes WHERE client_notes IS NOT NULL AND client_notes != ''")
-            v1_notes_count = v1_cursor.fetchone()[0]
-
-            v1_conn.close()
+            # Get counts from v1 database in one query, on the connection the migration used
+            v1_cursor = self._v1_conn.execute(
+                "SELECT (SELECT COUNT(*) FROM general_info), "
+                "(SELECT COUNT(*) FROM diet_info), "
+                "(SELECT COUNT(*) FROM notes WHERE client_notes IS NOT NULL AND client_notes != '')"
+            )
+            v1_client_count, v1_diet_count, v1_notes_count = v1_cursor.fetchone()
 
             # Get counts from v2 database
             v2_client_count = self.client_repo.count()
@@ -388,30 +598,31 @@ class V1ToV2Migrator:
     def _create_migration_report(self):
         """Create a detailed migration report"""
         try:
-            timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            report_file = Path(self.backup_dir) / f"migration_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.txt"
-
-            with open(report_file, 'w', encoding='utf-8') as f:
-                f.write("Pharmacy Management System Migration Report\n")
-                f.write("=" * 50 + "\n")
-                f.write(f"Migration Date: {timestamp}\n")
-                f.write(f"Source Database: {self.v1_db_path}\n")
-                f.write(f"Target Database: v2.0\n\n")
-
-                f.write("Migration Log:\n")
-                f.write("-" * 20 + "\n")
-                for log_entry in self.migration_log:
-                    f.write(f"• {log_entry}\n")
-
-                if self.errors:
-                    f.write("\nErrors:\n")
-                    f.write("-" * 10 + "\n")
-                    for error in self.errors:
-                        f.write(f"✗ {error}\n")
-                else:
-                    f.write("\n✓ Migration completed successfully with no errors!\n")
-
-                f.write(f"\nReport saved: {report_file}\n")
+            now = datetime.now()
+            timestamp = now.strftime("%Y-%m-%d %H:%M:%S")
+            report_file = self._backup_path / f"migration_report_{now.strftime('%Y%m%d_%H%M%S')}.txt"
+
+            # Build the whole report, then write it once
+            lines = [
+                "Pharmacy Management System Migration Report",
+                "=" * 50,
+                f"Migration Date: {timestamp}",
+                f"Source Database: {self.v1_db_path}",
+                "Target Database: v2.0",
+                "",
+                "Migration Log:",
+                "-" * 20,
+            ]
+            lines.extend(f"• {log_entry}" for log_entry in self.migration_log)
+
+            if self.errors:
+                lines.extend(["", "Errors:", "-" * 10])
+                lines.extend(f"✗ {error}" for error in self.errors)
+            else:
+                lines.extend(["", "✓ Migration completed successfully with no errors!"])
+
+            lines.extend(["", f"Report saved: {report_file}", ""])
+            report_file.write_text("\n".join(lines), encoding='utf-8')
 
             logger.info(f"Migration report created: {report_file}")
 
@@ -61,30 +61,35 @@ def get_package_info():
         "config_version": CONFIG_VERSION
     }
 
-def check_dependencies():
-    """Check if all required dependencies are available"""
+def check_core_dependencies():
+    """Check the Python version and the dependencies every entry point needs"""
     import sys
+    from importlib.util import find_spec
 
     # Check Python version
     if sys.version_info < MIN_PYTHON_VERSION:
         raise RuntimeError(f"Python {MIN_PYTHON_VERSION[0]}.{MIN_PYTHON_VERSION[1]}+ required")
 
+    # Check SQLAlchemy; find_spec locates the package without importing it
+    if find_spec("sqlalchemy") is None:
+        raise RuntimeError("SQLAlchemy is required but not installed")
+
+    return True
+
+def check_gui_dependencies():
+    """Check the dependencies only the GUI needs"""
+    from importlib.util import find_spec
+
     # Check PyQt6
-    try:
-        import PyQt6
-        # Additional version check could be added here
-    except ImportError:
+    if find_spec("PyQt6") is None:
         raise RuntimeError("PyQt6 is required but not installed")
 
-    # Check SQLAlchemy
-    try:
-        import sqlalchemy
-        # Additional version check could be added here
-    except ImportError:
-        raise RuntimeError("SQLAlchemy is required but not installed")
-
     return True
 
+def check_dependencies():
+    """Check if all required dependencies are available"""
+    return check_core_dependencies() and check_gui_dependencies()
+
 # Initialize logging for the package
 def setup_package_logging():
     """Setup basic package logging"""
@@ -98,9 +103,10 @@ def setup_package_logging():
         logger = logging.getLogger(__name__)
         logger.info(f"Pharmacy Management System v{__version__} package loaded")
 
-# Auto-setup when package is imported
+# Auto-setup when package is imported; GUI dependencies are left to the GUI entry point
+# so command line tools such as the v1 migration don't pay for them
 try:
-    check_dependencies()
+    check_core_dependencies()
     setup_package_logging()
 except Exception as e:
     import warnings
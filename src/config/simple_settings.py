@@ -4,14 +4,36 @@ Manages all configuration parameters for the Pharmacy Management System without
 """
 
 import os
+import sys
 import json
+import hashlib
+import threading
+from functools import lru_cache
 from pathlib import Path
 from typing import Optional, Dict, Any, List
 
+# orjson parses and writes settings much faster than json when it is installed
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 
 class DatabaseSettings:
     """Database configuration settings"""
 
+    __slots__ = (
+        'database_url',
+        'database_name',
+        'backup_location',
+        'auto_backup',
+        'backup_interval_hours',
+        'max_backups',
+        'pool_size',
+        'echo_sql',
+        '_callbacks'  # set by SettingsManager.register_callback
+    )
+
     def __init__(self):
         self.database_url = "sqlite:///pharmacy.db"
         self.database_name = "pharmacy.db"
@@ -26,6 +48,20 @@ class DatabaseSettings:
 class SecuritySettings:
     """Security and authentication settings"""
 
+    __slots__ = (
+        'min_password_length',
+        'require_uppercase',
+        'require_lowercase',
+        'require_digits',
+        'require_special_chars',
+        'session_timeout_minutes',
+        'max_login_attempts',
+        'lockout_duration_minutes',
+        'jwt_secret',
+        'session_timeout_hours',
+        '_callbacks'  # set by SettingsManager.register_callback
+    )
+
     def __init__(self):
         self.min_password_length = 8
         self.require_uppercase = True
@@ -43,8 +79,21 @@ class SecuritySettings:
 class UISettings:
     """User interface settings"""
 
+    __slots__ = (
+        'theme',
+        'language',
+        'default_font_family',
+        'default_font_size',
+        'enable_animations',
+        'show_splash_screen',
+        'remember_window_state',
+        'auto_save_interval',
+        'enable_tooltips',
+        '_callbacks'  # set by SettingsManager.register_callback
+    )
+
     def __init__(self):
-        self.theme = "default"
+        self.theme = "light"
         self.language = "ar"
         self.default_font_family = "Arial"
         self.default_font_size = 12
@@ -58,6 +107,18 @@ class UISettings:
 class LoggingSettings:
     """Logging configuration settings"""
 
+    __slots__ = (
+        'log_level',
+        'log_format',
+        'enable_console_logging',
+        'enable_file_logging',
+        'log_directory',
+        'log_file_name',
+        'max_log_size_mb',
+        'log_backup_count',
+        '_callbacks'  # set by SettingsManager.register_callback
+    )
+
     def __init__(self):
         self.log_level = "INFO"
         self.log_format = "{time:YYYY-MM-DD HH:mm:ss} | {level} | {name}:{function}:{line} - {message}"
@@ -72,6 +133,18 @@ class LoggingSettings:
 class ReportSettings:
     """Report generation settings"""
 
+    __slots__ = (
+        'default_format',
+        'output_directory',
+        'template_directory',
+        'include_logo',
+        'auto_open_reports',
+        'compression_level',
+        'page_size',
+        'page_orientation',
+        '_callbacks'  # set by SettingsManager.register_callback
+    )
+
     def __init__(self):
         self.default_format = "PDF"
         self.output_directory = "reports"
@@ -83,6 +156,77 @@ class ReportSettings:
         self.page_orientation = "portrait"
 
 
+# Settings section classes held by ApplicationSettings
+SECTION_CLASSES = (DatabaseSettings, SecuritySettings, UISettings, LoggingSettings, ReportSettings)
+
+# Public field names of each settings section, in definition order; the schema is fixed,
+# so they are collected once instead of filtering attributes on every save
+_PUBLIC_FIELDS = {
+    section_class: tuple(key for key in section_class.__slots__ if not key.startswith('_'))
+    for section_class in SECTION_CLASSES
+}
+
+
+def _loads_json(data: bytes) -> Any:
+    """Parse settings JSON, with orjson when it is installed"""
+    return orjson.loads(data) if orjson is not None else json.loads(data)
+
+
+def _dumps_json(data: Any) -> bytes:
+    """Serialize settings as indented UTF-8 JSON, with orjson when it is installed"""
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2)
+    return json.dumps(data, indent=2, ensure_ascii=False).encode('utf-8')
+
+
+def _write_atomic(path: Path, data: bytes):
+    """Write a file through a temporary sibling, so readers never see it half written"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temp_path = path.with_name(path.name + ".tmp")
+    temp_path.write_bytes(data)
+    os.replace(temp_path, path)
+
+
+def _mtime_ns(path: Path) -> Optional[int]:
+    """Get a file's st_mtime_ns, or None if it doesn't exist"""
+    try:
+        return path.stat().st_mtime_ns
+    except FileNotFoundError:
+        return None
+
+
+@lru_cache(maxsize=None)
+def get_app_data_path() -> Path:
+    """Get the application data directory based on the operating system"""
+    if sys.platform == "win32":
+        app_data = Path(os.environ.get("APPDATA", ""))
+        return app_data / "PharmacyManagement"
+    elif sys.platform == "darwin":
+        home = Path.home()
+        return home / "Library" / "Application Support" / "PharmacyManagement"
+    else:  # Linux and other Unix-like systems
+        home = Path.home()
+        return home / ".config" / "PharmacyManagement"
+
+
+# Settings file read at startup and written by save_to_file, in the per-user app data directory
+DEFAULT_CONFIG_FILE = get_app_data_path() / "settings.json"
+
+# Settings file used before settings moved to the app data directory, relative to the
+# working directory; read only while DEFAULT_CONFIG_FILE doesn't exist yet
+LEGACY_CONFIG_FILE = Path("config") / "settings.json"
+
+# Environment variable prefix -> settings section it overrides (None for top-level settings)
+ENV_PREFIXES = {
+    "APP": None,
+    "DB": "database",
+    "SEC": "security",
+    "UI": "ui",
+    "LOG": "logging",
+    "REPORT": "reports"
+}
+
+
 class ApplicationSettings:
     """Main application settings container"""
 
@@ -103,44 +247,79 @@ class ApplicationSettings:
         self.development_mode = False
         self.enable_profiling = False
 
-        # Load settings from file if it exists
+        # st_mtime_ns of the settings file when it was last read, None if it wasn't
+        self._source_mtime_ns: Optional[int] = None
+
+        # Load settings from file if it exists, then let environment variables override it
         self._load_from_file()
+        self._apply_env_overrides()
 
     def _load_from_file(self):
         """Load settings from configuration file"""
         try:
-            config_file = Path("config/settings.json")
+            config_file = DEFAULT_CONFIG_FILE
             if config_file.exists():
-                with open(config_file, 'r', encoding='utf-8') as f:
-                    config_data = json.load(f)
-                    self._update_from_dict(config_data)
+                mtime_ns = config_file.stat().st_mtime_ns
+                self._update_from_dict(_loads_json(config_file.read_bytes()))
+                self._source_mtime_ns = mtime_ns
+            elif LEGACY_CONFIG_FILE.exists():
+                # The next save writes these settings to DEFAULT_CONFIG_FILE
+                self._update_from_dict(_loads_json(LEGACY_CONFIG_FILE.read_bytes()))
         except Exception as e:
             print(f"Warning: Could not load settings from file: {e}")
 
+    def _apply_env_overrides(self):
+        """Override settings from prefixed environment variables, e.g. DB_ECHO_SQL=true"""
+        sections = {
+            prefix: getattr(self, name) if name else self
+            for prefix, name in ENV_PREFIXES.items()
+        }
+        for env_key, raw_value in os.environ.items():
+            prefix, _, key = env_key.partition("_")
+            section = sections.get(prefix.upper())
+            if section is None or not key:
+                continue
+
+            key = key.lower()
+            current = getattr(section, key, None)
+            if key.startswith('_') or not isinstance(current, (str, bool, int, float)):
+                continue
+
+            try:
+                if isinstance(current, bool):
+                    value = raw_value.strip().lower() in ("1", "true", "yes", "on")
+                else:
+                    value = type(current)(raw_value)
+                setattr(section, key, value)
+            except ValueError:
+                print(f"Warning: Ignoring invalid value for {env_key}: {raw_value}")
+
     def _update_from_dict(self, config_data: Dict[str, Any]):
         """Update settings from dictionary"""
         for section_name, section_data in config_data.items():
-            if hasattr(self, section_name):
-                section = getattr(self, section_name)
-                for key, value in section_data.items():
-                    if hasattr(section, key):
-                        setattr(section, key, value)
+            if not hasattr(self, section_name) or section_name.startswith('_'):
+                continue
 
-    def save_to_file(self, file_path: Optional[str] = None):
-        """Save current settings to file"""
-        try:
-            if file_path is None:
-                config_dir = Path("config")
-                config_dir.mkdir(exist_ok=True)
-                file_path = config_dir / "settings.json"
+            # to_dict writes top-level values such as app_name next to the sections
+            section = getattr(self, section_name)
+            if not isinstance(section_data, dict):
+                if not isinstance(section, SECTION_CLASSES):
+                    setattr(self, section_name, section_data)
+                continue
 
-            settings_dict = self.to_dict()
+            for key, value in section_data.items():
+                if hasattr(section, key):
+                    setattr(section, key, value)
 
-            with open(file_path, 'w', encoding='utf-8') as f:
-                json.dump(settings_dict, f, indent=2, ensure_ascii=False)
+    def save_to_file(self, file_path: Optional[str] = None) -> bool:
+        """Save current settings to file"""
+        try:
+            _write_atomic(Path(file_path) if file_path else DEFAULT_CONFIG_FILE, _dumps_json(self.to_dict()))
+            return True
 
         except Exception as e:
             print(f"Error saving settings: {e}")
+            return False
 
     def to_dict(self) -> Dict[str, Any]:
         """Convert settings to dictionary"""
@@ -160,10 +339,23 @@ class ApplicationSettings:
 
     def _section_to_dict(self, section) -> Dict[str, Any]:
         """Convert settings section to dictionary"""
-        return {
-            key: value for key, value in section.__dict__.items()
-            if not key.startswith('_')
-        }
+        return {key: getattr(section, key) for key in _PUBLIC_FIELDS[type(section)]}
+
+
+_VALID_LOG_LEVELS = ("DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL")
+
+# (check on ApplicationSettings, section, error message) for validate_settings, in report order
+_VALIDATION_RULES = (
+    (lambda s: bool(s.database.database_url), "database", "Database URL is required"),
+    (lambda s: s.database.pool_size >= 1, "database", "Pool size must be at least 1"),
+    (lambda s: s.database.backup_interval_hours >= 1, "database", "Backup interval must be at least 1 hour"),
+    (lambda s: s.security.min_password_length >= 4, "security", "Minimum password length must be at least 4"),
+    (lambda s: s.security.session_timeout_minutes >= 1, "security", "Session timeout must be at least 1 minute"),
+    (lambda s: s.security.max_login_attempts >= 1, "security", "Max login attempts must be at least 1"),
+    (lambda s: s.logging.log_level in _VALID_LOG_LEVELS, "logging",
+     f"Log level must be one of: {', '.join(_VALID_LOG_LEVELS)}"),
+    (lambda s: s.logging.max_log_size_mb >= 1, "logging", "Max log size must be at least 1 MB"),
+)
 
 
 class SettingsManager:
@@ -171,40 +363,84 @@ class SettingsManager:
 
     def __init__(self):
         self.settings = ApplicationSettings()
-        self._callbacks = {}
+
+        # Settings file -> st_mtime_ns when it was last loaded or saved; unchanged files aren't re-read
+        self._file_mtimes: Dict[Path, int] = {}
+        # Settings file -> digest of the bytes last saved to it; unchanged settings aren't rewritten
+        self._saved_digests: Dict[Path, bytes] = {}
+
+        # Set by update_setting; changes are written together by flush() instead of one save per key
+        self._dirty = False
+        if self.settings._source_mtime_ns is not None:
+            self._file_mtimes[DEFAULT_CONFIG_FILE] = self.settings._source_mtime_ns
 
     def get_settings(self) -> ApplicationSettings:
         """Get current application settings"""
         return self.settings
 
     def load_settings(self, file_path: Optional[str] = None) -> ApplicationSettings:
-        """Load settings from file"""
-        if file_path:
-            try:
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    config_data = json.load(f)
-                    self.settings._update_from_dict(config_data)
-            except Exception as e:
-                print(f"Error loading settings from {file_path}: {e}")
+        """Load settings from file, or from the default settings file if it changed since last read"""
+        config_file = Path(file_path) if file_path else DEFAULT_CONFIG_FILE
+        try:
+            mtime_ns = config_file.stat().st_mtime_ns
+            if self._file_mtimes.get(config_file) != mtime_ns:
+                self.settings._update_from_dict(_loads_json(config_file.read_bytes()))
+                self._file_mtimes[config_file] = mtime_ns
+        except FileNotFoundError:
+            if file_path:
+                print(f"Error loading settings from {file_path}: file not found")
+        except Exception as e:
+            print(f"Error loading settings from {config_file}: {e}")
 
         return self.settings
 
-    def save_settings(self, file_path: Optional[str] = None):
-        """Save current settings to file"""
-        self.settings.save_to_file(file_path)
+    def save_settings(self, file_path: Optional[str] = None) -> bool:
+        """Save current settings to file, skipping the write if neither they nor the file changed"""
+        config_file = Path(file_path) if file_path else DEFAULT_CONFIG_FILE
+        try:
+            data = _dumps_json(self.settings.to_dict())
+            digest = hashlib.blake2b(data, digest_size=16).digest()
+            if (self._saved_digests.get(config_file) == digest
+                    and _mtime_ns(config_file) == self._file_mtimes.get(config_file)):
+                if config_file == DEFAULT_CONFIG_FILE:
+                    self._dirty = False
+                return True
+
+            _write_atomic(config_file, data)
+            if config_file == DEFAULT_CONFIG_FILE:
+                self._dirty = False
+            self._saved_digests[config_file] = digest
+            # Our own write shouldn't make the next load_settings re-read the file
+            self._file_mtimes[config_file] = config_file.stat().st_mtime_ns
+            return True
+
+        except Exception as e:
+            print(f"Error saving settings: {e}")
+            return False
+
+    def mark_dirty(self):
+        """Record that settings changed outside update_setting, so flush() saves them"""
+        self._dirty = True
+
+    def flush(self) -> bool:
+        """Save settings if they changed since the last save"""
+        if not self._dirty:
+            return True
+        return self.save_settings()
 
     def update_setting(self, section: str, key: str, value: Any) -> bool:
-        """Update a specific setting"""
+        """Update a specific setting; call flush() to save the changes"""
         try:
             if hasattr(self.settings, section):
                 section_obj = getattr(self.settings, section)
                 if hasattr(section_obj, key):
                     setattr(section_obj, key, value)
+                    self._dirty = True
 
-                    # Trigger callbacks
-                    callback_key = f"{section}.{key}"
-                    if callback_key in self._callbacks:
-                        for callback in self._callbacks[callback_key]:
+                    # Trigger callbacks, kept on the section object by key
+                    callbacks = getattr(section_obj, '_callbacks', None)
+                    if callbacks:
+                        for callback in callbacks.get(key, ()):
                             try:
                                 callback(value)
                             except Exception as e:
@@ -234,62 +470,40 @@ class SettingsManager:
 
     def register_callback(self, section: str, key: str, callback):
         """Register callback for setting changes"""
-        callback_key = f"{section}.{key}"
-        if callback_key not in self._callbacks:
-            self._callbacks[callback_key] = []
-        self._callbacks[callback_key].append(callback)
+        try:
+            section_obj = getattr(self.settings, section)
+            callbacks = getattr(section_obj, '_callbacks', None)
+            if callbacks is None:
+                callbacks = section_obj._callbacks = {}
+            callbacks.setdefault(key, []).append(callback)
+        except AttributeError as e:
+            print(f"Error registering callback for {section}.{key}: {e}")
 
     def validate_settings(self) -> Dict[str, List[str]]:
         """Validate current settings and return any errors"""
         errors = {}
-
-        # Validate database settings
-        db_errors = []
-        if not self.settings.database.database_url:
-            db_errors.append("Database URL is required")
-        if self.settings.database.pool_size < 1:
-            db_errors.append("Pool size must be at least 1")
-        if self.settings.database.backup_interval_hours < 1:
-            db_errors.append("Backup interval must be at least 1 hour")
-
-        if db_errors:
-            errors["database"] = db_errors
-
-        # Validate security settings
-        security_errors = []
-        if self.settings.security.min_password_length < 4:
-            security_errors.append("Minimum password length must be at least 4")
-        if self.settings.security.session_timeout_minutes < 1:
-            security_errors.append("Session timeout must be at least 1 minute")
-        if self.settings.security.max_login_attempts < 1:
-            security_errors.append("Max login attempts must be at least 1")
-
-        if security_errors:
-            errors["security"] = security_errors
-
-        # Validate logging settings
-        logging_errors = []
-        valid_log_levels = ["DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"]
-        if self.settings.logging.log_level not in valid_log_levels:
-            logging_errors.append(f"Log level must be one of: {', '.join(valid_log_levels)}")
-        if self.settings.logging.max_log_size_mb < 1:
-            logging_errors.append("Max log size must be at least 1 MB")
-
-        if logging_errors:
-            errors["logging"] = logging_errors
-
+        for is_valid, section, message in _VALIDATION_RULES:
+            if not is_valid(self.settings):
+                errors.setdefault(section, []).append(message)
         return errors
 
 
-# Global settings manager instance
+# Global settings manager instance, created once under the lock
 _settings_manager = None
+_settings_manager_lock = threading.Lock()
 
 def get_settings_manager() -> SettingsManager:
     """Get the global settings manager instance"""
     global _settings_manager
-    if _settings_manager is None:
-        _settings_manager = SettingsManager()
-    return _settings_manager
+    # Lock-free once created; the lock only keeps racing first callers from reading the file twice
+    manager = _settings_manager
+    if manager is not None:
+        return manager
+
+    with _settings_manager_lock:
+        if _settings_manager is None:
+            _settings_manager = SettingsManager()
+        return _settings_manager
 
 def get_settings() -> ApplicationSettings:
     """Get the current application settings"""
@@ -3,11 +3,32 @@ Controllers Package
 Exports all controller classes for the Pharmacy Management System
 """
 
-from .base import BaseController, ControllerManager, get_controller_manager, get_controller
-from .client import ClientController
-from .diet import DietController
-from .report import ReportController
-from .auth import AuthController, User, Session, UserRole, Permission, SessionStatus
+from importlib import import_module
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .base import BaseController, ControllerManager, get_controller_manager, get_controller
+    from .client import ClientController
+    from .diet import DietController
+    from .report import ReportController
+    from .auth import AuthController, User, Session, UserRole, Permission, SessionStatus
+
+# Exported name -> submodule defining it; submodules are imported on first access
+_LAZY_EXPORTS = {
+    'BaseController': 'base',
+    'ControllerManager': 'base',
+    'get_controller_manager': 'base',
+    'get_controller': 'base',
+    'ClientController': 'client',
+    'DietController': 'diet',
+    'ReportController': 'report',
+    'AuthController': 'auth',
+    'User': 'auth',
+    'Session': 'auth',
+    'UserRole': 'auth',
+    'Permission': 'auth',
+    'SessionStatus': 'auth'
+}
 
 __all__ = [
     # Base controller infrastructure
@@ -31,6 +52,32 @@ __all__ = [
 ]
 
 
+def __getattr__(name: str):
+    """Import the submodule behind an exported name on first access (PEP 562)"""
+    submodule = _LAZY_EXPORTS.get(name)
+    if submodule is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(import_module(f".{submodule}", __name__), name)
+    globals()[name] = value  # Later lookups skip __getattr__
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
+
+
+# loguru is only needed for the status lines below, so it is imported on first use
+_logger = None
+
+def _get_logger():
+    """Get the loguru logger, importing it on first use"""
+    global _logger
+    if _logger is None:
+        from loguru import logger
+        _logger = logger
+    return _logger
+
 
 def initialize_all_controllers(app_instance=None) -> bool:
     """
@@ -42,6 +89,12 @@ def initialize_all_controllers(app_instance=None) -> bool:
     Returns:
         bool: True if all controllers initialized successfully
     """
+    from .base import get_controller_manager
+    from .auth import AuthController
+    from .client import ClientController
+    from .diet import DietController
+    from .report import ReportController
+
     try:
         # Get controller manager
         manager = get_controller_manager()
@@ -67,17 +120,14 @@ def initialize_all_controllers(app_instance=None) -> bool:
         success = manager.initialize_all()
 
         if success:
-            from loguru import logger
-            logger.info("All controllers initialized successfully")
+            _get_logger().info("All controllers initialized successfully")
         else:
-            from loguru import logger
-            logger.error("Failed to initialize some controllers")
+            _get_logger().error("Failed to initialize some controllers")
 
         return success
 
     except Exception as e:
-        from loguru import logger
-        logger.error(f"Error initializing controllers: {e}")
+        _get_logger().error(f"Error initializing controllers: {e}")
         return False
 
 
@@ -85,34 +135,42 @@ def cleanup_all_controllers() -> None:
     """
     Cleanup all controllers and resources
     """
+    from .base import get_controller_manager
+    from config.simple_settings import get_settings_manager
+
     try:
         manager = get_controller_manager()
         manager.cleanup_all()
 
-        from loguru import logger
-        logger.info("All controllers cleaned up successfully")
+        # Write out settings changed through update_setting since the last save
+        get_settings_manager().flush()
+
+        _get_logger().info("All controllers cleaned up successfully")
 
     except Exception as e:
-        from loguru import logger
-        logger.error(f"Error cleaning up controllers: {e}")
+        _get_logger().error(f"Error cleaning up controllers: {e}")
 
 
 # Convenience functions for getting specific controllers
-def get_auth_controller() -> AuthController:
+def get_auth_controller() -> "AuthController":
     """Get the authentication controller"""
+    from .base import get_controller
     return get_controller('auth')
 
 
-def get_client_controller() -> ClientController:
+def get_client_controller() -> "ClientController":
     """Get the client management controller"""
+    from .base import get_controller
     return get_controller('client')
 
 
-def get_diet_controller() -> DietController:
+def get_diet_controller() -> "DietController":
     """Get the diet management controller"""
+    from .base import get_controller
     return get_controller('diet')
 
 
-def get_report_controller() -> ReportController:
+def get_report_controller() -> "ReportController":
     """Get the report generation controller"""
+    from .base import get_controller
     return get_controller('report')
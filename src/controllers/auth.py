@@ -7,6 +7,7 @@ for the Pharmacy Management System
 from typing import Dict, List, Optional, Any, Tuple
 from datetime import datetime, timedelta
 import hashlib
+import hmac
 import secrets
 import jwt
 from enum import Enum
@@ -896,7 +897,7 @@ class AuthController(BaseController):
 
     def _verify_password(self, password: str, password_hash: str, salt: str) -> bool:
         """Verify password against hash"""
-        return self._hash_password(password, salt) == password_hash
+        return hmac.compare_digest(self._hash_password(password, salt), password_hash or "")
 
     def reset_failed_login_attempts(self, username: str) -> bool:
         """
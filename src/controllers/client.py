@@ -4,17 +4,47 @@ Handles client management, BMI calculations, demographics, and follow-up trackin
 for the Pharmacy Management System
 """
 
+import csv
 from typing import Dict, List, Optional, Any, Tuple
 from datetime import datetime, date, timedelta
-from PyQt6.QtCore import pyqtSignal
+from PyQt6.QtCore import pyqtSignal, QThread
 from loguru import logger
 
 from .base import BaseController
+from models import get_repository
 from models.client import Client, ClientNote, ClientRepository, ClientNoteRepository
 from models.diet import DietRecord, DietRepository, BMICategory, WeightCondition
 from utils.validation import ClientValidator, MedicalValidator
 
 
+class FollowUpCheckThread(QThread):
+    """Thread for loading upcoming follow-ups without blocking the UI"""
+
+    follow_ups_loaded = pyqtSignal(list)  # list of (client_id, client_name, formatted follow_up_date)
+    check_failed = pyqtSignal(str)  # error message
+
+    DATE_FORMAT = "%d/%m/%Y"
+
+    def __init__(self, days_ahead: int = 7):
+        super().__init__()
+        self.days_ahead = days_ahead
+
+    def run(self):
+        """Query upcoming follow-ups in the background thread"""
+        try:
+            rows = get_repository("client").get_upcoming_follow_up_rows(self.days_ahead)
+            # Dates are formatted here so the UI thread only inserts ready-made text
+            date_format = self.DATE_FORMAT
+            self.follow_ups_loaded.emit([
+                (client_id, client_name, follow_up_date.strftime(date_format))
+                for client_id, client_name, follow_up_date in rows
+            ])
+
+        except Exception as e:
+            logger.error(f"Follow-up check failed: {e}")
+            self.check_failed.emit(str(e))
+
+
 class ClientController(BaseController):
     """Controller for client management operations"""
 
@@ -129,11 +159,10 @@ class ClientController(BaseController):
 
             validated_data = validation_result['data']
 
-            # Update client
-            success = self.client_repo.update_client(client_id, validated_data)
+            # Update client; the repository returns the refreshed row, so no second lookup
+            updated_client = self.client_repo.update_client(client_id, **validated_data)
 
-            if success:
-                updated_client = self.get_client_by_id(client_id)
+            if updated_client:
                 self.emit_success("Client Updated", f"Client {updated_client.full_display_name} updated successfully")
                 self.client_updated.emit(updated_client.to_dict())
                 self.emit_data_changed("client_updated", {"client_id": client_id})
@@ -164,7 +193,7 @@ class ClientController(BaseController):
                 return False
 
             # Perform soft delete
-            success = self.client_repo.update_client(client_id, {"is_active": False})
+            success = self.client_repo.update_client(client_id, is_active=False)
 
             if success:
                 self.emit_success("Client Deleted", f"Client {client.full_display_name} deleted successfully")
@@ -195,6 +224,40 @@ class ClientController(BaseController):
             logger.error(f"Error getting client {client_id}: {e}")
             return None
 
+    def get_client_with_note_rows(self, client_id: str, note_limit: int = 50
+                                  ) -> Tuple[Optional[Client], List[Tuple[date, str, str, str]]]:
+        """
+        Get a client together with its latest notes in a single database round trip
+
+        Args:
+            client_id: Client ID
+            note_limit: Maximum number of notes to return
+
+        Returns:
+            Tuple: (client or None, (date, type, title, content) note rows)
+        """
+        try:
+            return self.client_repo.get_client_with_note_rows(client_id, note_limit)
+        except Exception as e:
+            logger.error(f"Error getting client {client_id} with notes: {e}")
+            return None, []
+
+    def get_client_profile(self, client_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Get the profile fields of a client without loading the full entity
+
+        Args:
+            client_id: Client ID
+
+        Returns:
+            dict: Profile fields keyed by column name, or None
+        """
+        try:
+            return self.client_repo.get_client_profile(client_id)
+        except Exception as e:
+            logger.error(f"Error getting client profile {client_id}: {e}")
+            return None
+
     def get_client_by_pharmacy_id(self, pharmacy_id: str) -> Optional[Client]:
         """
         Get a client by pharmacy ID
@@ -235,6 +298,58 @@ class ClientController(BaseController):
             logger.error(f"Error searching clients: {e}")
             return []
 
+    def get_client_summaries(self, search_term: str = None, after_id: int = None,
+                             limit: int = None) -> List[Tuple[int, str, str]]:
+        """
+        Get a page of lightweight client rows for list views
+
+        Args:
+            search_term: Optional name or pharmacy ID filter
+            after_id: Return only rows after this client id, or None from the start
+            limit: Maximum number of rows, or None for all
+
+        Returns:
+            List[Tuple[int, str, str]]: (id, pharmacy ID, name) rows
+        """
+        try:
+            return self.client_repo.get_client_summaries(search_term, after_id, limit)
+        except Exception as e:
+            logger.error(f"Error getting client summaries: {e}")
+            return []
+
+    def count_client_summaries(self, search_term: str = None) -> int:
+        """
+        Count the client rows matching a list filter
+
+        Args:
+            search_term: Optional name or pharmacy ID filter
+
+        Returns:
+            int: Number of matching active clients
+        """
+        try:
+            return self.client_repo.count_client_summaries(search_term)
+        except Exception as e:
+            logger.error(f"Error counting client summaries: {e}")
+            return 0
+
+    def get_client_search_terms(self, prefix: str, limit: int = 20) -> List[str]:
+        """
+        Get client names and pharmacy IDs for search autocomplete
+
+        Args:
+            prefix: Text typed so far
+            limit: Maximum number of clients to match
+
+        Returns:
+            List[str]: Names and pharmacy IDs of matching active clients
+        """
+        try:
+            return self.client_repo.get_search_terms(prefix, limit)
+        except Exception as e:
+            logger.error(f"Error getting client search terms: {e}")
+            return []
+
     def get_all_clients(self, include_inactive: bool = False) -> List[Client]:
         """
         Get all clients
@@ -421,13 +536,11 @@ class ClientController(BaseController):
             bool: True if successful
         """
         try:
-            success = self.client_repo.update_client(client_id, {
-                "next_follow_up": follow_up_date,
-                "follow_up_notes": notes
-            })
+            client = self.client_repo.update_client(
+                client_id, next_follow_up=follow_up_date, follow_up_notes=notes
+            )
 
-            if success:
-                client = self.get_client_by_id(client_id)
+            if client:
                 self.emit_success("Follow-up Scheduled",
                                 f"Follow-up scheduled for {client.full_display_name} on {follow_up_date}")
                 self.emit_data_changed("follow_up_scheduled", {
@@ -435,7 +548,7 @@ class ClientController(BaseController):
                     "follow_up_date": follow_up_date.isoformat()
                 })
 
-            return success
+            return client is not None
 
         except Exception as e:
             self.handle_database_error(e, "scheduling follow-up")
@@ -457,16 +570,10 @@ class ClientController(BaseController):
             if not client:
                 return False
 
-            # Update last visit date and clear next follow-up
-            success = self.client_repo.update_client(client_id, {
-                "last_visit_date": datetime.now().date(),
-                "next_follow_up": None,
-                "follow_up_notes": ""
-            })
-
-            # Add completion note if notes provided
-            if success and notes:
-                self.add_client_note(client_id, f"Follow-up completed: {notes}", "follow_up")
+            # Update last visit, clear the follow-up and add the completion note together
+            success = self.client_repo.complete_follow_up(
+                client_id, f"Follow-up completed: {notes}" if notes else None
+            )
 
             if success:
                 self.emit_success("Follow-up Completed",
@@ -539,6 +646,23 @@ class ClientController(BaseController):
             logger.error(f"Error getting notes for client {client_id}: {e}")
             return []
 
+    def get_client_note_rows(self, client_id: str, limit: int = 50) -> List[Tuple[date, str, str, str]]:
+        """
+        Get a client's latest notes as plain rows for history views
+
+        Args:
+            client_id: Client ID
+            limit: Maximum number of notes to return
+
+        Returns:
+            List[Tuple[date, str, str, str]]: (date, type, title, content) rows
+        """
+        try:
+            return self.note_repo.get_note_rows(client_id, limit)
+        except Exception as e:
+            logger.error(f"Error getting note rows for client {client_id}: {e}")
+            return []
+
     def search_client_notes(self, search_term: str, client_id: str = None) -> List[ClientNote]:
         """
         Search client notes
@@ -691,6 +815,34 @@ class ClientController(BaseController):
             self.emit_error("Export Failed", f"Failed to export client data: {str(e)}")
             return []
 
+    def export_clients_csv(self, export_path: str) -> bool:
+        """
+        Export active clients to a CSV file
+
+        Rows are streamed from the database straight into a buffered writer,
+        so memory use does not grow with the number of clients.
+
+        Args:
+            export_path: Destination CSV file path
+
+        Returns:
+            bool: True if successful
+        """
+        try:
+            # utf-8-sig so spreadsheet applications detect the Arabic text correctly
+            with open(export_path, 'w', newline='', encoding='utf-8-sig', buffering=1 << 20) as csv_file:
+                writer = csv.writer(csv_file)
+                writer.writerow(column.key for column in ClientRepository.PROFILE_COLUMNS)
+                writer.writerows(self.client_repo.iter_client_rows())
+
+            self.emit_success("Export Complete", f"Clients exported to: {export_path}")
+            return True
+
+        except Exception as e:
+            logger.error(f"Error exporting clients to CSV: {e}")
+            self.emit_error("Export Failed", f"Failed to export clients: {str(e)}")
+            return False
+
     def validate_import_data(self, import_data: List[Dict[str, Any]]) -> Dict[str, Any]:
         """
         Validate data before import
@@ -4,9 +4,10 @@ Handles diet record management, meal planning, nutrition tracking, and dietary r
 for the Pharmacy Management System
 """
 
+import threading
 from typing import Dict, List, Optional, Any, Tuple
 from datetime import datetime, date, timedelta
-from PyQt6.QtCore import pyqtSignal
+from PyQt6.QtCore import pyqtSignal, QThread, QCoreApplication
 from loguru import logger
 
 from .base import BaseController
@@ -18,6 +19,59 @@ from models.client import Client, ClientRepository
 from utils.validation import MedicalValidator, NutritionValidator
 
 
+class DietSaveThread(QThread):
+    """Thread writing queued day meal plan saves so autosave never blocks the UI"""
+
+    plan_saved = pyqtSignal(object, object)  # client_id, meal plan id
+    save_failed = pyqtSignal(str)  # error message
+
+    def __init__(self, controller: "DietController"):
+        super().__init__()
+        self.controller = controller
+        # Pending saves keyed by (client_id, meal_date); a newer snapshot of the same day
+        # replaces the queued one, so saves for other clients or days are never dropped
+        self._pending: Dict[Tuple[int, date], Tuple[Dict[str, str], Optional[str]]] = {}
+        self._condition = threading.Condition()
+        self._stopping = False
+
+    def submit(self, client_id: int, meal_date: date, meals: Dict[str, str], notes: Optional[str]) -> None:
+        """Queue a day's meal plan save, replacing any pending save for the same client and day"""
+        with self._condition:
+            self._pending[(client_id, meal_date)] = (meals, notes)
+            self._condition.notify()
+
+    def stop(self) -> None:
+        """Finish the queued saves and end the thread"""
+        if self.isRunning():
+            with self._condition:
+                self._stopping = True
+                self._condition.notify()
+            self.wait()
+
+    def run(self):
+        """Write queued saves in the background thread until stopped"""
+        while True:
+            with self._condition:
+                while not self._pending and not self._stopping:
+                    self._condition.wait()
+                if not self._pending:
+                    return
+                key = next(iter(self._pending))
+                meals, notes = self._pending.pop(key)
+
+            client_id, meal_date = key
+            try:
+                plan_id = self.controller.meal_plan_repo.save_day_plan(client_id, meal_date, meals, notes)
+                if plan_id:
+                    self.plan_saved.emit(client_id, plan_id)
+                else:
+                    self.save_failed.emit("Meal plan was not saved")
+
+            except Exception as e:
+                logger.error(f"Background meal plan save failed: {e}")
+                self.save_failed.emit(str(e))
+
+
 class DietController(BaseController):
     """Controller for diet and nutrition management operations"""
 
@@ -35,6 +89,7 @@ class DietController(BaseController):
         self.diet_repo = None
         self.meal_plan_repo = None
         self.client_repo = None
+        self.save_thread: Optional[DietSaveThread] = None
         self.medical_validator = MedicalValidator()
         self.nutrition_validator = NutritionValidator()
 
@@ -166,6 +221,41 @@ class DietController(BaseController):
             self.handle_database_error(e, "updating diet record")
             return False
 
+    def save_day_plan_async(self, client_id: int, meal_date: date,
+                            meals: Dict[str, str], notes: Optional[str] = None) -> DietSaveThread:
+        """
+        Queue a save of a client's meal plan for one day on the background save thread
+
+        Args:
+            client_id: Client ID
+            meal_date: Day the meals belong to
+            meals: Meal text keyed by MealPlan meal column (breakfast, lunch, ...)
+            notes: Meal plan notes
+
+        Returns:
+            DietSaveThread: The save thread, whose signals report the outcome
+        """
+        if self.save_thread is None:
+            self.save_thread = DietSaveThread(self)
+            self.save_thread.plan_saved.connect(self._on_day_plan_saved)
+            self.save_thread.save_failed.connect(self._on_day_plan_save_failed)
+            # Flush queued saves before the event loop ends
+            app = QCoreApplication.instance()
+            if app is not None:
+                app.aboutToQuit.connect(self.save_thread.stop)
+            self.save_thread.start()
+
+        self.save_thread.submit(client_id, meal_date, meals, notes)
+        return self.save_thread
+
+    def _on_day_plan_saved(self, client_id: int, meal_plan_id: int):
+        """Report a finished background meal plan save"""
+        self.emit_data_changed("meal_plan_saved", {"client_id": client_id, "meal_plan_id": meal_plan_id})
+
+    def _on_day_plan_save_failed(self, message: str):
+        """Report a failed background meal plan save"""
+        self.emit_error("Autosave Failed", message)
+
     def get_diet_record_by_id(self, record_id: str) -> Optional[DietRecord]:
         """
         Get a diet record by ID
@@ -982,6 +1072,9 @@ class DietController(BaseController):
         try:
             super().cleanup()
             # Additional cleanup specific to DietController
+            if self.save_thread is not None:
+                self.save_thread.stop()
+                self.save_thread = None
             self.diet_repo = None
             self.meal_plan_repo = None
             self.client_repo = None
@@ -7,17 +7,173 @@ for the Pharmacy Management System
 from typing import Dict, List, Optional, Any, Tuple
 from datetime import datetime, date, timedelta
 from pathlib import Path
+from functools import lru_cache
+import html
 import json
+import shutil
+import string
+import threading
+import time
 from PyQt6.QtCore import pyqtSignal, QThread, pyqtSlot
-from PyQt6.QtGui import QPixmap, QPainter, QFont
-from PyQt6.QtPrintSupport import QPrinter, QPrintDialog
 from loguru import logger
 
 from .base import BaseController
 from models.client import Client, ClientRepository
 from models.diet import DietRecord, MealPlan, DietRepository, MealPlanRepository
 from utils.validation import ReportValidator
-from utils.resource_manager import get_resource_manager
+from utils.resource_manager import get_resource_manager, REPORT_FONTS
+
+
+# Base stylesheet for generated PDF reports; @font-face rules are prepended at load time
+REPORT_CSS = """
+@page {
+    size: A4;
+    margin: 1.5cm;
+}
+body {
+    font-family: 'Noto Sans Arabic', sans-serif;
+    font-size: 11pt;
+    direction: rtl;
+}
+h1 {
+    font-size: 18pt;
+    color: #2c3e50;
+}
+h2 {
+    font-size: 14pt;
+    color: #34495e;
+}
+table {
+    width: 100%;
+    border-collapse: collapse;
+    table-layout: fixed;
+}
+table.fields th {
+    width: 30%;
+}
+th, td {
+    border: 1px solid #bdc3c7;
+    padding: 4px 6px;
+}
+"""
+
+# Static document skeleton; only the escaped title, client name and sections vary per report
+REPORT_HTML_TEMPLATE = string.Template(
+    "<html><head><meta charset='utf-8'><title>$title</title></head>"
+    "<body><h1>$title</h1><p>$client_name</p>$sections</body></html>"
+)
+
+# Section fragments as bound str.format methods, parsed once; arguments must be escaped
+SECTION_HEADING_HTML = "<h2>{}</h2>".format
+FIELD_ROW_HTML = "<tr><th>{}</th><td>{}</td></tr>".format
+FIELD_TABLE_HTML = "{}<table class='fields'>{}</table>".format
+HEADER_CELL_HTML = "<th>{}</th>".format
+CELL_HTML = "<td>{}</td>".format
+ROW_HTML = "<tr>{}</tr>".format
+RECORD_TABLE_HTML = "{}<table><tr>{}</tr>{}</table>".format
+LIST_ITEM_HTML = "<li>{}</li>".format
+SPANNING_ROW_HTML = "<tr><td colspan='{}'>{}</td></tr>".format
+LIST_HTML = "{}<ul>{}</ul>".format
+PARAGRAPH_HTML = "{}<p>{}</p>".format
+
+# Display columns of the record lists and field sections shared by several reports
+MEAL_PLAN_COLUMNS = ('meal_date', 'breakfast', 'lunch', 'dinner', 'afternoon_snack', 'compliance_score', 'notes')
+DIET_STATUS_FIELDS = (
+    'current_weight', 'target_weight', 'height', 'bmi', 'bmi_category',
+    'activity_level', 'weight_goal', 'weight_change', 'progress_to_goal'
+)
+
+# Sections rendered for each report type, in order, as (report_data key, include_sections name,
+# display columns). Sections without an include_sections name are always rendered; None columns
+# show every field. Keys not listed here (template, generation_options, ...) are never rendered.
+REPORT_LAYOUTS = {
+    "client_profile": (
+        ('client', 'personal_info', (
+            'pharmacy_id', 'full_name', 'age', 'gender', 'phone', 'email', 'address',
+            'registration_date', 'last_visit', 'next_follow_up'
+        )),
+        ('medical_info', 'medical_history', None),
+        ('bmi_history', 'medical_history', ('date', 'bmi', 'weight', 'height')),
+        ('current_status', 'current_status', None),
+        ('recent_meal_plans', 'meal_plans', MEAL_PLAN_COLUMNS),
+    ),
+    "diet_progress": (
+        ('client', None, ('pharmacy_id',)),
+        ('date_range', None, None),
+        ('progress_metrics', None, None),
+        ('diet_records', None, ('created_at',) + DIET_STATUS_FIELDS),
+        ('weight_history', None, ('date', 'weight', 'bmi', 'weight_change')),
+        ('meal_plans', None, MEAL_PLAN_COLUMNS),
+    ),
+    "follow_up": (
+        ('client', None, ('pharmacy_id',)),
+        ('visit_info', None, None),
+        ('current_status', None, DIET_STATUS_FIELDS),
+        ('progress_data', None, None),
+        ('recommendations', None, None),
+    ),
+    "nutrition_summary": (
+        ('client', None, ('pharmacy_id',)),
+        ('summary_period', None, None),
+        ('nutrition_metrics', None, None),
+        ('compliance_analysis', None, None),
+        ('meal_plans', None, MEAL_PLAN_COLUMNS),
+        ('recommendations', None, None),
+    ),
+}
+
+REPORT_TIMESTAMP_FORMAT = "%Y%m%d_%H%M%S"
+REPORT_FILENAME_FORMAT = "{}_{}_{}.pdf".format
+
+
+def build_report_output_path(directory: str, prefix: str, pharmacy_id: str) -> Path:
+    """Build a timestamped output path for a client report"""
+    # time.strftime formats the local time directly, without a datetime object
+    timestamp = time.strftime(REPORT_TIMESTAMP_FORMAT)
+    return Path(directory) / REPORT_FILENAME_FORMAT(prefix, pharmacy_id, timestamp)
+
+
+# Shared WeasyPrint font configuration, created on first report
+_font_configuration = None
+# FontConfiguration is not thread-safe, so report threads set it up and render under one lock
+_render_lock = threading.RLock()
+
+
+def get_report_font_configuration():
+    """Get the WeasyPrint font configuration shared by all reports"""
+    global _font_configuration
+    with _render_lock:
+        if _font_configuration is None:
+            from weasyprint.text.fonts import FontConfiguration
+            _font_configuration = FontConfiguration()
+        return _font_configuration
+
+
+def get_report_stylesheet():
+    """Get the compiled report stylesheet, parsed and font-registered once"""
+    with _render_lock:
+        return _build_report_stylesheet()
+
+
+@lru_cache(maxsize=1)
+def _build_report_stylesheet():
+    """Compile the report stylesheet and register its fonts"""
+    from weasyprint import CSS
+
+    resource_manager = get_resource_manager()
+    font_faces = []
+    for font_file, weight in REPORT_FONTS:
+        font_path = resource_manager.get_font_path(font_file)
+        if font_path:
+            font_faces.append(
+                f"@font-face {{ font-family: 'Noto Sans Arabic'; font-weight: {weight}; "
+                f"src: url('{Path(font_path).as_uri()}'); }}"
+            )
+
+    return CSS(
+        string="\n".join(font_faces) + REPORT_CSS,
+        font_config=get_report_font_configuration()
+    )
 
 
 class ReportGenerationThread(QThread):
@@ -56,28 +212,114 @@ class ReportGenerationThread(QThread):
             logger.error(f"Report generation failed: {e}")
             self.report_failed.emit(str(e))
 
+    def _build_html(self) -> str:
+        """Build the HTML document for the report"""
+        escape = html.escape
+        title = escape(str(self.report_data.get('template', {}).get('title', self.report_type)))
+        client_name = escape(str(self.report_data.get('client', {}).get('full_name', '')))
+        include_sections = self.report_data.get('include_sections')
+
+        sections = "".join(
+            self._build_section_html(name, self.report_data[name], columns)
+            for name, section, columns in REPORT_LAYOUTS[self.report_type]
+            if self.report_data.get(name)
+            and (section is None or include_sections is None or section in include_sections)
+        )
+
+        return REPORT_HTML_TEMPLATE.substitute(title=title, client_name=client_name, sections=sections)
+
+    @classmethod
+    def _build_section_html(cls, name: str, value: Any, columns: Optional[Tuple[str, ...]] = None) -> str:
+        """Render one report_data entry as a heading plus table or list, limited to columns if given"""
+        heading = SECTION_HEADING_HTML(cls._label_html(name))
+
+        if isinstance(value, dict):
+            keys = columns if columns is not None else value.keys()
+            rows = "".join(
+                FIELD_ROW_HTML(cls._label_html(key), cls._value_html(value.get(key)))
+                for key in keys
+            )
+            return FIELD_TABLE_HTML(heading, rows)
+
+        if isinstance(value, list):
+            records = [entry for entry in value if isinstance(entry, dict)]
+            if not records:
+                items = "".join(LIST_ITEM_HTML(cls._value_html(item)) for item in value)
+                return LIST_HTML(heading, items)
+
+            if columns is None:
+                columns = tuple(dict.fromkeys(key for record in records for key in record))
+            header = "".join(HEADER_CELL_HTML(cls._label_html(column)) for column in columns)
+            # Entries that aren't records get a row of their own across all columns
+            rows = "".join(
+                ROW_HTML("".join(CELL_HTML(cls._value_html(entry.get(column))) for column in columns))
+                if isinstance(entry, dict)
+                else SPANNING_ROW_HTML(len(columns), cls._value_html(entry))
+                for entry in value
+            )
+            return RECORD_TABLE_HTML(heading, header, rows)
+
+        return PARAGRAPH_HTML(heading, cls._value_html(value))
+
+    @staticmethod
+    def _label_html(name: Any) -> str:
+        """Turn a data key such as 'next_follow_up' into an escaped label"""
+        return html.escape(str(name).replace('_', ' ').title())
+
+    @classmethod
+    def _value_html(cls, value: Any, nested: bool = False) -> str:
+        """Render a field value as escaped text; nested dicts and lists are flattened into it"""
+        if value is None:
+            return ""
+        if isinstance(value, dict):
+            separator = ", " if nested else "<br>"
+            return separator.join(
+                f"{cls._label_html(key)}: {cls._value_html(item, nested=True)}"
+                for key, item in value.items()
+            )
+        if isinstance(value, (list, tuple)):
+            return "<br>".join(cls._value_html(item, nested=True) for item in value)
+        return cls._text_html(value)
+
+    @staticmethod
+    def _text_html(value: Any) -> str:
+        """Escape stored plain text for the report, keeping its line breaks"""
+        return html.escape(str(value)).replace("\n", "<br>")
+
+    def _write_pdf(self, html_content: str) -> None:
+        """Render HTML to the output PDF using the cached stylesheet"""
+        from weasyprint import HTML
+
+        Path(self.output_path).parent.mkdir(parents=True, exist_ok=True)
+        with _render_lock:
+            HTML(string=html_content).write_pdf(
+                str(self.output_path),
+                stylesheets=[get_report_stylesheet()],
+                font_config=get_report_font_configuration()
+            )
+
     def _generate_client_profile_report(self):
         """Generate client profile report"""
         self.report_progress.emit(30, "Generating client profile...")
-        # Implementation would go here
+        self._write_pdf(self._build_html())
         self.report_progress.emit(90, "Finalizing client profile report...")
 
     def _generate_diet_progress_report(self):
         """Generate diet progress report"""
         self.report_progress.emit(30, "Analyzing diet progress...")
-        # Implementation would go here
+        self._write_pdf(self._build_html())
         self.report_progress.emit(90, "Finalizing diet progress report...")
 
     def _generate_follow_up_report(self):
         """Generate follow-up report"""
         self.report_progress.emit(30, "Compiling follow-up data...")
-        # Implementation would go here
+        self._write_pdf(self._build_html())
         self.report_progress.emit(90, "Finalizing follow-up report...")
 
     def _generate_nutrition_summary_report(self):
         """Generate nutrition summary report"""
         self.report_progress.emit(30, "Calculating nutrition metrics...")
-        # Implementation would go here
+        self._write_pdf(self._build_html())
         self.report_progress.emit(90, "Finalizing nutrition summary...")
 
 
@@ -223,9 +465,7 @@ class ReportController(BaseController):
                 return False
 
             # Generate output file path
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            filename = f"client_profile_{client.pharmacy_id}_{timestamp}.pdf"
-            output_path = Path("reports/client_profiles") / filename
+            output_path = build_report_output_path("reports/client_profiles", "client_profile", client.pharmacy_id)
 
             # Start background generation
             return self._start_report_generation("client_profile", report_data, output_path)
@@ -267,9 +507,7 @@ class ReportController(BaseController):
                 return False
 
             # Generate output file path
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            filename = f"diet_progress_{client.pharmacy_id}_{timestamp}.pdf"
-            output_path = Path("reports/diet_progress") / filename
+            output_path = build_report_output_path("reports/diet_progress", "diet_progress", client.pharmacy_id)
 
             # Start background generation
             return self._start_report_generation("diet_progress", report_data, output_path)
@@ -307,9 +545,7 @@ class ReportController(BaseController):
             report_data = self._prepare_follow_up_data(client, visit_date, custom_options)
 
             # Generate output file path
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            filename = f"follow_up_{client.pharmacy_id}_{timestamp}.pdf"
-            output_path = Path("reports/follow_ups") / filename
+            output_path = build_report_output_path("reports/follow_ups", "follow_up", client.pharmacy_id)
 
             # Start background generation
             return self._start_report_generation("follow_up", report_data, output_path)
@@ -344,9 +580,7 @@ class ReportController(BaseController):
             report_data = self._prepare_nutrition_summary_data(client, period_days, custom_options)
 
             # Generate output file path
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            filename = f"nutrition_summary_{client.pharmacy_id}_{timestamp}.pdf"
-            output_path = Path("reports/nutrition_summaries") / filename
+            output_path = build_report_output_path("reports/nutrition_summaries", "nutrition_summary", client.pharmacy_id)
 
             # Start background generation
             return self._start_report_generation("nutrition_summary", report_data, output_path)
@@ -906,6 +1140,9 @@ class ReportController(BaseController):
                 self.emit_error("File Not Found", f"Report file not found: {file_path}")
                 return False
 
+            # QtPrintSupport is only needed here, so keep it out of startup
+            from PyQt6.QtPrintSupport import QPrinter, QPrintDialog
+
             # Create printer and show print dialog
             printer = QPrinter(QPrinter.PrinterMode.HighResolution)
             print_dialog = QPrintDialog(printer)
@@ -948,7 +1185,6 @@ class ReportController(BaseController):
             # TODO: Implement format conversion logic
             # For now, just copy the file if it's the same format
             if export_format.lower() == "pdf":
-                import shutil
                 shutil.copy2(file_path, export_path)
 
                 self.emit_success("Export Complete", f"Report exported to: {export_path}")
@@ -34,8 +34,8 @@ from PyQt6.QtGui import QPixmap, QFont, QIcon
 
 # Application imports
 from views.main_window import MainWindow
-from config.settings import AppSettings
-from utils.resource_manager import ResourceManager
+from config.settings import AppSettings, get_settings_manager
+from utils.resource_manager import ResourceManager, REPORT_FONTS
 from controllers.auth import AuthController
 from models.base import DatabaseManager
 
@@ -75,7 +75,9 @@ class ApplicationInitializer(QObject):
 
             # Step 2: Initialize resource manager
             self.progress_updated.emit("تحميل الموارد..." if self._is_rtl() else "Loading resources...", 30)
-            # ResourceManager initializes in constructor, no separate initialize method needed
+            # ResourceManager initializes in constructor; check report fonts once here
+            # so a missing font is reported at startup rather than on each export
+            self.resource_manager.validate_fonts(font_file for font_file, _ in REPORT_FONTS)
 
             # Step 3: Initialize database
             self.progress_updated.emit("تهيئة قاعدة البيانات..." if self._is_rtl() else "Initializing database...", 50)
@@ -131,6 +133,10 @@ class PharmacyManagementApp(QApplication):
         self.initializer: Optional[ApplicationInitializer] = None
         self.init_thread: Optional[QThread] = None
 
+        # Write out settings changed since the last save on every way out of the event loop,
+        # including the last window closing, which doesn't go through quit()
+        self.aboutToQuit.connect(self._flush_settings)
+
         # Setup application
         self._setup_application()
         self._setup_error_handling()
@@ -154,6 +160,11 @@ class PharmacyManagementApp(QApplication):
         font = QFont(font_family, 10)
         self.setFont(font)
 
+        # Set layout direction once; every window and widget inherits it
+        self.setLayoutDirection(
+            Qt.LayoutDirection.RightToLeft if language == 'ar' else Qt.LayoutDirection.LeftToRight
+        )
+
         # Set style
         self.setStyle('Fusion')  # Use Fusion style for better cross-platform appearance
 
@@ -333,6 +344,13 @@ class PharmacyManagementApp(QApplication):
         # Exit application
         self.quit()
 
+    def _flush_settings(self):
+        """Save settings changed since the last save before the application exits."""
+        try:
+            get_settings_manager().flush()
+        except Exception as e:
+            logger.error(f"Failed to save settings: {e}")
+
     def _handle_logout(self):
         """Handle user logout event."""
         logger.info("User logged out")
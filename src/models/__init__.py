@@ -59,9 +59,12 @@ REPOSITORIES = {
     "meal_plan": MealPlanRepository
 }
 
+# Repositories hold no per-caller state, so one instance per model is shared
+_repository_instances = {}
+
 def get_repository(model_name: str):
     """
-    Get repository instance for a model
+    Get the shared repository instance for a model
 
     Args:
         model_name: Name of the model
@@ -69,10 +72,13 @@ def get_repository(model_name: str):
     Returns:
         Repository instance or None if not found
     """
-    repo_class = REPOSITORIES.get(model_name.lower())
-    if repo_class:
-        return repo_class()
-    return None
+    model_name = model_name.lower()
+    repository = _repository_instances.get(model_name)
+    if repository is None:
+        repo_class = REPOSITORIES.get(model_name)
+        if repo_class:
+            repository = _repository_instances.setdefault(model_name, repo_class())
+    return repository
 
 def get_all_models():
     """Get list of all available model classes"""
@@ -4,12 +4,15 @@ Provides base classes and database setup for the Pharmacy Management System
 """
 
 import os
+import shutil
+import sqlite3
 import sys
+from contextlib import contextmanager
 from datetime import datetime
-from typing import Optional, Dict, Any, Type, TypeVar
+from typing import Optional, Dict, Any, List, Type, TypeVar, Iterator
 from pathlib import Path
 
-from sqlalchemy import create_engine, Column, Integer, String, DateTime, Text, Boolean
+from sqlalchemy import create_engine, event, insert, text, Column, Integer, String, DateTime, Text, Boolean
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, Session
 from sqlalchemy.pool import StaticPool
@@ -21,6 +24,31 @@ ModelType = TypeVar("ModelType", bound="BaseModel")
 # Create the declarative base
 Base = declarative_base()
 
+# PRAGMAs applied to every new SQLite connection
+SQLITE_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-65536",
+    "PRAGMA mmap_size=268435456",
+    "PRAGMA busy_timeout=5000",
+)
+
+# Prepared statements kept per SQLite connection, and compiled queries kept per engine
+SQLITE_STATEMENT_CACHE_SIZE = 256
+SQLALCHEMY_QUERY_CACHE_SIZE = 1000
+
+# Extra PRAGMAs for one-off bulk loads such as the v1 migration: a ~256 MB page cache
+SQLITE_BULK_LOAD_PRAGMAS = (
+    "PRAGMA cache_size=-262144",
+)
+
+# Connection execution option naming the BEGIN mode (e.g. IMMEDIATE) for a transaction
+SQLITE_BEGIN_MODE_OPTION = "sqlite_begin_mode"
+
+# Pages copied per step of an online backup, letting writers run in between
+SQLITE_BACKUP_PAGES = 1024
+
 
 class BaseModel(Base):
     """
@@ -92,15 +120,23 @@ class DatabaseManager:
         try:
             # Create engine with appropriate settings for SQLite
             if self.database_url.startswith("sqlite"):
+                # An in-memory database exists only on its one connection; file databases
+                # get a connection per thread so background readers don't share it
+                is_memory = ":memory:" in self.database_url or self.database_url == "sqlite://"
+                pool_args = {"poolclass": StaticPool} if is_memory else {}
                 self.engine = create_engine(
                     self.database_url,
-                    poolclass=StaticPool,
+                    **pool_args,
                     connect_args={
                         "check_same_thread": False,
-                        "timeout": 20
+                        "timeout": 20,
+                        "cached_statements": SQLITE_STATEMENT_CACHE_SIZE
                     },
+                    query_cache_size=SQLALCHEMY_QUERY_CACHE_SIZE,
                     echo=False  # Set to True for SQL query debugging
                 )
+                event.listen(self.engine, "connect", self._apply_sqlite_pragmas)
+                event.listen(self.engine, "begin", self._begin_sqlite_transaction)
             else:
                 self.engine = create_engine(self.database_url)
 
@@ -117,10 +153,38 @@ class DatabaseManager:
             logger.error(f"Failed to initialize database: {e}")
             raise
 
+    @staticmethod
+    def _apply_sqlite_pragmas(dbapi_connection, connection_record) -> None:
+        """Switch new SQLite connections to WAL with relaxed fsync"""
+        # Disable pysqlite's implicit transactions; _begin_sqlite_transaction issues BEGIN instead
+        dbapi_connection.isolation_level = None
+
+        cursor = dbapi_connection.cursor()
+        try:
+            for pragma in SQLITE_PRAGMAS:
+                cursor.execute(pragma)
+        finally:
+            cursor.close()
+
+    @staticmethod
+    def _begin_sqlite_transaction(connection) -> None:
+        """Open every session transaction explicitly so read bursts and DDL share one BEGIN/COMMIT"""
+        # Write sessions ask for BEGIN IMMEDIATE so their first read already holds the write lock
+        begin_mode = connection.get_execution_options().get(SQLITE_BEGIN_MODE_OPTION)
+        connection.exec_driver_sql(f"BEGIN {begin_mode}" if begin_mode else "BEGIN")
+
     def create_tables(self) -> None:
         """Create all tables in the database"""
         try:
-            Base.metadata.create_all(bind=self.engine)
+            # One transaction for the whole schema setup, so it commits (and syncs) once
+            with self.engine.begin() as connection:
+                Base.metadata.create_all(bind=connection)
+
+                # create_all skips existing tables, so add indexes introduced since
+                for table in Base.metadata.sorted_tables:
+                    for index in table.indexes:
+                        index.create(bind=connection, checkfirst=True)
+
             logger.info("Database tables created successfully")
         except Exception as e:
             logger.error(f"Failed to create database tables: {e}")
@@ -141,12 +205,51 @@ class DatabaseManager:
             raise RuntimeError("Database not initialized")
         return self.SessionLocal()
 
+    def get_write_session(self) -> Session:
+        """Get a new session whose transaction takes the SQLite write lock up front"""
+        session = self.get_session()
+        if self.database_url.startswith("sqlite"):
+            # Avoids SQLITE_BUSY when a deferred read transaction later tries to upgrade to a write
+            session.connection(execution_options={SQLITE_BEGIN_MODE_OPTION: "IMMEDIATE"})
+        return session
+
+    @contextmanager
+    def bulk_load(self) -> Iterator[None]:
+        """Tune SQLite connections for a bulk load, returning to the normal settings afterwards"""
+        if not self.database_url.startswith("sqlite"):
+            yield
+            return
+
+        def apply_bulk_load_pragmas(dbapi_connection, connection_record, connection_proxy):
+            cursor = dbapi_connection.cursor()
+            try:
+                for pragma in SQLITE_BULK_LOAD_PRAGMAS:
+                    cursor.execute(pragma)
+            finally:
+                cursor.close()
+
+        event.listen(self.engine, "checkout", apply_bulk_load_pragmas)
+        try:
+            yield
+        finally:
+            event.remove(self.engine, "checkout", apply_bulk_load_pragmas)
+            # Drop the tuned connections; new ones get only the regular connect-time PRAGMAs
+            self.engine.dispose()
+
     def test_connection(self) -> bool:
         """Test database connection"""
         try:
-            from sqlalchemy import text
             with self.get_session() as session:
-                session.execute(text("SELECT 1"))
+                if not self.database_url.startswith("sqlite"):
+                    session.execute(text("SELECT 1"))
+                    return True
+
+                # Confirm the connect-time PRAGMAs took effect; file databases should be in WAL
+                journal_mode = session.execute(text("PRAGMA journal_mode")).scalar()
+                if journal_mode != "wal" and ":memory:" not in self.database_url:
+                    logger.warning(f"SQLite journal mode is {journal_mode}, expected wal")
+                else:
+                    logger.debug(f"SQLite journal mode: {journal_mode}")
                 return True
         except Exception as e:
             logger.error(f"Database connection test failed: {e}")
@@ -159,8 +262,6 @@ class DatabaseManager:
             return False
 
         try:
-            import shutil
-
             # Extract database file path from URL
             db_file_path = self.database_url.replace("sqlite:///", "")
 
@@ -175,8 +276,14 @@ class DatabaseManager:
                 backup_dir.mkdir(exist_ok=True)
                 backup_path = backup_dir / f"pharmacy_backup_{timestamp}.db"
 
-            # Create backup
-            shutil.copy2(db_file_path, backup_path)
+            # Copy pages with SQLite's online backup API, which includes WAL contents
+            # not yet checkpointed into the main file; fall back to a plain file copy
+            try:
+                self._copy_sqlite_pages(str(backup_path))
+            except sqlite3.Error as e:
+                logger.warning(f"Online backup failed, copying database file instead: {e}")
+                shutil.copy2(db_file_path, backup_path)
+
             logger.info(f"Database backup created: {backup_path}")
             return True
 
@@ -184,6 +291,18 @@ class DatabaseManager:
             logger.error(f"Database backup failed: {e}")
             return False
 
+    def _copy_sqlite_pages(self, backup_path: str) -> None:
+        """Copy the live database into backup_path in 1024-page steps"""
+        source = self.engine.raw_connection()
+        try:
+            destination = sqlite3.connect(backup_path)
+            try:
+                source.driver_connection.backup(destination, pages=SQLITE_BACKUP_PAGES)
+            finally:
+                destination.close()
+        finally:
+            source.close()
+
     def restore_database(self, backup_path: str) -> bool:
         """Restore database from backup"""
         if not self.database_url.startswith("sqlite"):
@@ -191,8 +310,6 @@ class DatabaseManager:
             return False
 
         try:
-            import shutil
-
             if not os.path.exists(backup_path):
                 logger.error(f"Backup file not found: {backup_path}")
                 return False
@@ -262,7 +379,7 @@ class BaseRepository:
 
     def create(self, **kwargs) -> ModelType:
         """Create a new record"""
-        with self.db_manager.get_session() as session:
+        with self.db_manager.get_write_session() as session:
             try:
                 instance = self.model_class(**kwargs)
                 session.add(instance)
@@ -274,6 +391,44 @@ class BaseRepository:
                 logger.error(f"Failed to create {self.model_class.__name__}: {e}")
                 raise
 
+    def bulk_create(self, rows: List[Dict[str, Any]]) -> List[int]:
+        """Create many records in one transaction; returns their ids in input order"""
+        return self.bulk_create_instances([self.model_class(**row) for row in rows])
+
+    def bulk_insert(self, rows: List[Dict[str, Any]]) -> int:
+        """Insert many rows as one executemany of a single prepared INSERT; returns the row count"""
+        if not rows:
+            return 0
+
+        with self.db_manager.get_write_session() as session:
+            try:
+                # No instances are built and no ids are read back, unlike bulk_create
+                session.execute(insert(self.model_class), rows)
+                session.commit()
+                return len(rows)
+            except Exception as e:
+                session.rollback()
+                logger.error(f"Failed to bulk insert {self.model_class.__name__}: {e}")
+                return 0
+
+    def bulk_create_instances(self, instances: List[ModelType]) -> List[int]:
+        """Insert many new instances in one transaction; returns their ids in input order"""
+        if not instances:
+            return []
+
+        with self.db_manager.get_write_session() as session:
+            try:
+                session.add_all(instances)
+                # One flush batches the INSERTs and assigns every primary key
+                session.flush()
+                record_ids = [instance.id for instance in instances]
+                session.commit()
+                return record_ids
+            except Exception as e:
+                session.rollback()
+                logger.error(f"Failed to bulk create {self.model_class.__name__}: {e}")
+                return []
+
     def get_by_id(self, record_id: int) -> Optional[ModelType]:
         """Get a record by ID"""
         with self.db_manager.get_session() as session:
@@ -304,7 +459,7 @@ class BaseRepository:
 
     def update(self, record_id: int, **kwargs) -> Optional[ModelType]:
         """Update a record"""
-        with self.db_manager.get_session() as session:
+        with self.db_manager.get_write_session() as session:
             try:
                 instance = session.query(self.model_class).filter(
                     self.model_class.id == record_id
@@ -313,9 +468,17 @@ class BaseRepository:
                 if not instance:
                     return None
 
-                for key, value in kwargs.items():
-                    if hasattr(instance, key) and key not in ['id', 'created_at']:
-                        setattr(instance, key, value)
+                changes = [
+                    (key, value) for key, value in kwargs.items()
+                    if hasattr(instance, key) and key not in ['id', 'created_at']
+                ]
+
+                # Saving an unchanged form should not write (and sync) the row again
+                if all(getattr(instance, key) == value for key, value in changes):
+                    return instance
+
+                for key, value in changes:
+                    setattr(instance, key, value)
 
                 instance.updated_at = datetime.utcnow()
                 session.commit()
@@ -329,7 +492,7 @@ class BaseRepository:
 
     def delete(self, record_id: int, soft_delete: bool = True) -> bool:
         """Delete a record (soft delete by default)"""
-        with self.db_manager.get_session() as session:
+        with self.db_manager.get_write_session() as session:
             try:
                 instance = session.query(self.model_class).filter(
                     self.model_class.id == record_id
@@ -4,8 +4,10 @@ Defines the client/patient data model and operations for the Pharmacy Management
 """
 
 from datetime import datetime, date, timedelta
-from typing import Optional, List, Dict, Any
-from sqlalchemy import Column, Integer, String, Text, Date, Boolean, Float, DateTime, ForeignKey
+from itertools import chain
+from typing import Optional, List, Dict, Any, Tuple, Iterator
+from sqlalchemy import Column, Integer, String, Text, Date, Boolean, Float, DateTime, ForeignKey, Index, cast, func, select, bindparam, event, table, column, literal_column
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.orm import relationship, Session
 from sqlalchemy.ext.hybrid import hybrid_property
 from loguru import logger
@@ -77,7 +79,7 @@ class Client(BaseModel):
 
     # Visit Information
     visit_purpose = Column(Text, nullable=True)
-    follow_up_date = Column(Date, nullable=True)
+    follow_up_date = Column(Date, nullable=True, index=True)
     last_visit_date = Column(Date, nullable=True)
     visit_count = Column(Integer, default=0)
 
@@ -90,6 +92,11 @@ class Client(BaseModel):
     diet_records = relationship("DietRecord", back_populates="client", cascade="all, delete-orphan")
     notes = relationship("ClientNote", back_populates="client", cascade="all, delete-orphan")
 
+    # Numeric value of the pharmacy ID, indexed so the next ID is a single index lookup
+    __table_args__ = (
+        Index("ix_clients_pharmacy_number", cast(client_pharmacy_id, Integer)),
+    )
+
     @hybrid_property
     def full_display_name(self) -> str:
         """Get formatted display name with ID"""
@@ -196,6 +203,11 @@ class ClientNote(BaseModel):
     # Relationships
     client = relationship("Client", back_populates="notes")
 
+    # Serves a client's notes newest-first without scanning or sorting the notes table
+    __table_args__ = (
+        Index("ix_client_notes_client_created", "client_id", "created_at"),
+    )
+
     def get_tags_list(self) -> List[str]:
         """Get tags as a list"""
         if self.tags:
@@ -210,11 +222,127 @@ class ClientNote(BaseModel):
         return f"<ClientNote(id={self.id}, client_id={self.client_id}, type='{self.note_type}')>"
 
 
+# Trigram index over client names and pharmacy IDs, kept in sync with the clients table by triggers;
+# trigrams answer substring searches ("123" in "00123", "رحمن" in "عبدالرحمن") like the LIKE scans did
+CLIENT_SEARCH_DDL = (
+    """CREATE VIRTUAL TABLE IF NOT EXISTS clients_fts USING fts5(
+        client_name, client_pharmacy_id, content='clients', content_rowid='id', tokenize='trigram'
+    )""",
+    """CREATE TRIGGER IF NOT EXISTS clients_fts_insert AFTER INSERT ON clients BEGIN
+        INSERT INTO clients_fts(rowid, client_name, client_pharmacy_id)
+        VALUES (new.id, new.client_name, new.client_pharmacy_id);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS clients_fts_delete AFTER DELETE ON clients BEGIN
+        INSERT INTO clients_fts(clients_fts, rowid, client_name, client_pharmacy_id)
+        VALUES ('delete', old.id, old.client_name, old.client_pharmacy_id);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS clients_fts_update AFTER UPDATE OF client_name, client_pharmacy_id ON clients BEGIN
+        INSERT INTO clients_fts(clients_fts, rowid, client_name, client_pharmacy_id)
+        VALUES ('delete', old.id, old.client_name, old.client_pharmacy_id);
+        INSERT INTO clients_fts(rowid, client_name, client_pharmacy_id)
+        VALUES (new.id, new.client_name, new.client_pharmacy_id);
+    END""",
+)
+
+CLIENT_SEARCH_TRIGGERS = ("clients_fts_insert", "clients_fts_delete", "clients_fts_update")
+
+# Lightweight handle for querying the index; not part of the metadata, so create_all ignores it
+clients_fts = table("clients_fts", column("rowid"))
+
+# Trigram MATCH needs at least three characters; shorter terms are searched with LIKE
+MIN_FTS_TERM_LENGTH = 3
+
+# Set once the index exists; searches fall back to LIKE scans without it
+_client_search_enabled = False
+
+
+@event.listens_for(BaseModel.metadata, "after_create")
+def _create_client_search_index(target, connection, **kwargs) -> None:
+    """Create the client full-text index, filling it from existing rows the first time"""
+    global _client_search_enabled
+    if connection.dialect.name != "sqlite":
+        return
+
+    try:
+        existing_sql = connection.exec_driver_sql(
+            "SELECT sql FROM sqlite_master WHERE type = 'table' AND name = 'clients_fts'"
+        ).scalar()
+        if existing_sql is not None and "trigram" not in existing_sql:
+            # Indexes created before the trigram tokenizer only matched word prefixes; rebuild them
+            connection.exec_driver_sql("DROP TABLE clients_fts")
+            existing_sql = None
+
+        for statement in CLIENT_SEARCH_DDL:
+            connection.exec_driver_sql(statement)
+        if existing_sql is None:
+            connection.exec_driver_sql("INSERT INTO clients_fts(clients_fts) VALUES ('rebuild')")
+
+        _client_search_enabled = True
+
+    except Exception as e:
+        # SQLite builds without FTS5 or the trigram tokenizer keep working through LIKE searches;
+        # drop the sync triggers so client writes don't fail on a missing index
+        for trigger in CLIENT_SEARCH_TRIGGERS:
+            connection.exec_driver_sql(f"DROP TRIGGER IF EXISTS {trigger}")
+        logger.warning(f"Client full-text search unavailable: {e}")
+
+
+def _client_search_filter(search_term: str):
+    """Build the WHERE clause matching clients by name or pharmacy ID"""
+    if _client_search_enabled and len(search_term) >= MIN_FTS_TERM_LENGTH:
+        # Quote the whole term so user input is never parsed as FTS syntax; with the trigram
+        # tokenizer a quoted string matches anywhere in either column, as %term% did
+        match = '"{}"'.format(search_term.replace('"', '""'))
+        return Client.id.in_(
+            select(clients_fts.c.rowid).where(literal_column("clients_fts").op("MATCH")(match))
+        )
+
+    search_term = f"%{search_term}%"
+    return Client.client_name.ilike(search_term) | Client.client_pharmacy_id.like(search_term)
+
+
+def _query_note_rows(session: Session, client_id: int, limit: int) -> List[Tuple[date, str, str, str]]:
+    """Fetch (date, type, title, content) rows of a client's latest notes in an open session"""
+    rows = session.query(
+        ClientNote.created_at, ClientNote.note_type, ClientNote.title, ClientNote.content
+    ).filter(
+        ClientNote.client_id == client_id,
+        ClientNote.is_active == True
+    ).order_by(ClientNote.created_at.desc()).limit(limit)
+
+    return [
+        (created_at.date(), note_type, title, content)
+        for created_at, note_type, title, content in rows
+    ]
+
+
 class ClientRepository(BaseRepository):
     """
     Repository class for client data operations
     """
 
+    # Columns shown on the client profile form
+    PROFILE_COLUMNS = (
+        Client.id, Client.client_pharmacy_id, Client.client_name, Client.age,
+        Client.date_of_birth, Client.gender, Client.phone, Client.email, Client.address,
+        Client.job, Client.work_effort, Client.diseases, Client.allergies, Client.medications,
+        Client.previous_attempts, Client.current_treatment, Client.visit_purpose,
+        Client.follow_up_date
+    )
+
+    # Statements for per-selection lookups, built once; each call only binds parameters
+    PROFILE_QUERY = select(*PROFILE_COLUMNS).where(
+        Client.id == bindparam("client_id"),
+        Client.is_active == True
+    )
+    PHARMACY_ID_QUERY = select(Client).where(
+        Client.client_pharmacy_id == bindparam("pharmacy_id"),
+        Client.is_active == True
+    )
+
+    # Next numeric pharmacy ID, shared by all instances; loaded from the database on first use
+    _next_pharmacy_number: Optional[int] = None
+
     def __init__(self):
         super().__init__(get_database_manager(), Client)
 
@@ -232,7 +360,8 @@ class ClientRepository(BaseRepository):
                     raise ValueError("Invalid email format")
 
             # Generate pharmacy ID if not provided
-            if 'client_pharmacy_id' not in kwargs or not kwargs['client_pharmacy_id']:
+            generated_id = not kwargs.get('client_pharmacy_id')
+            if generated_id:
                 kwargs['client_pharmacy_id'] = self.generate_pharmacy_id()
 
             # Calculate age from date of birth if provided
@@ -245,56 +374,256 @@ class ClientRepository(BaseRepository):
                     (today.month, today.day) < (dob.month, dob.day)
                 )
 
-            return self.create(**kwargs)
+            try:
+                client = self.create(**kwargs)
+            except Exception:
+                if generated_id:
+                    self._reset_pharmacy_number()
+                raise
+
+            if client:
+                self._advance_pharmacy_number(kwargs['client_pharmacy_id'])
+            return client
 
         except Exception as e:
             raise ValueError(f"Failed to create client: {str(e)}")
 
     def generate_pharmacy_id(self) -> str:
         """Generate the next available pharmacy ID"""
-        with self.db_manager.get_session() as session:
+        if ClientRepository._next_pharmacy_number is None:
+            with self.db_manager.get_session() as session:
+                try:
+                    # Get the highest existing pharmacy ID (served by ix_clients_pharmacy_number)
+                    result = session.query(
+                        func.max(cast(Client.client_pharmacy_id, Integer))
+                    ).scalar()
+
+                    ClientRepository._next_pharmacy_number = int(result) + 1 if result else 1
+
+                except Exception:
+                    # Fallback: use timestamp-based ID
+                    return datetime.now().strftime("%Y%m%d%H%M%S")
+
+        # Format as 5-digit ID with leading zeros
+        return f"{ClientRepository._next_pharmacy_number:05d}"
+
+    def upsert_client(self, **kwargs) -> Optional[int]:
+        """Insert a client, or update the one with the same pharmacy ID, in a single statement"""
+        generated_id = not kwargs.get('client_pharmacy_id')
+        if generated_id:
+            kwargs['client_pharmacy_id'] = self.generate_pharmacy_id()
+
+        with self.db_manager.get_write_session() as session:
             try:
-                # Get the highest existing pharmacy ID
-                result = session.query(Client.client_pharmacy_id).filter(
-                    Client.client_pharmacy_id.regexp(r'^\d+$')
-                ).order_by(Client.client_pharmacy_id.desc()).first()
+                statement = sqlite_insert(Client).values(**kwargs)
+                # A generated ID is for a new client; if another writer took it, fail instead of
+                # overwriting that client
+                if not generated_id:
+                    updated_columns = {
+                        key: statement.excluded[key] for key in kwargs if key != 'client_pharmacy_id'
+                    }
+                    # ON CONFLICT ... DO UPDATE does not run column onupdate hooks
+                    updated_columns['updated_at'] = datetime.utcnow()
+                    statement = statement.on_conflict_do_update(
+                        index_elements=[Client.client_pharmacy_id],
+                        set_=updated_columns
+                    )
+                statement = statement.returning(Client.id)
+
+                client_id = session.execute(statement).scalar_one()
+                session.commit()
+                self._advance_pharmacy_number(kwargs['client_pharmacy_id'])
+                return client_id
+
+            except Exception as e:
+                session.rollback()
+                if generated_id:
+                    self._reset_pharmacy_number()
+                logger.error(f"Failed to upsert client: {e}")
+                return None
 
-                if result and result[0]:
-                    max_id = int(result[0])
-                    new_id = max_id + 1
-                else:
-                    new_id = 1
+    def _advance_pharmacy_number(self, pharmacy_id: str) -> None:
+        """Move the cached next ID past a pharmacy ID that was just stored"""
+        if ClientRepository._next_pharmacy_number is not None and str(pharmacy_id).isdigit():
+            ClientRepository._next_pharmacy_number = max(
+                ClientRepository._next_pharmacy_number, int(pharmacy_id) + 1
+            )
 
-                # Format as 5-digit ID with leading zeros
-                return f"{new_id:05d}"
+    @staticmethod
+    def _reset_pharmacy_number() -> None:
+        """Forget the cached next ID, so the next generated ID is read from the database again"""
+        # Another process or the v1 migrator may have taken the cached number
+        ClientRepository._next_pharmacy_number = None
+
+    def bulk_upsert_clients(self, rows: List[Dict[str, Any]]) -> Dict[str, int]:
+        """Insert or update many clients by pharmacy ID in one transaction; returns {pharmacy ID: client id}"""
+        if not rows:
+            return {}
+
+        generated_id = False
+        for row in rows:
+            if not row.get('client_pharmacy_id'):
+                row['client_pharmacy_id'] = self.generate_pharmacy_id()
+                self._advance_pharmacy_number(row['client_pharmacy_id'])
+                generated_id = True
+
+        with self.db_manager.get_write_session() as session:
+            try:
+                statement = sqlite_insert(Client)
+                updated_columns = {
+                    key: statement.excluded[key] for key in rows[0] if key != 'client_pharmacy_id'
+                }
+                # ON CONFLICT ... DO UPDATE does not run column onupdate hooks
+                updated_columns['updated_at'] = datetime.utcnow()
+                statement = statement.on_conflict_do_update(
+                    index_elements=[Client.client_pharmacy_id],
+                    set_=updated_columns
+                )
+                session.execute(statement, rows)
+
+                # Read the ids back by pharmacy ID, in slices that stay under SQLite's bound parameter limit
+                pharmacy_ids = [str(row['client_pharmacy_id']) for row in rows]
+                client_ids = {}
+                for start in range(0, len(pharmacy_ids), 500):
+                    client_ids.update(session.execute(
+                        select(Client.client_pharmacy_id, Client.id).where(
+                            Client.client_pharmacy_id.in_(pharmacy_ids[start:start + 500])
+                        )
+                    ).all())
+
+                session.commit()
+                for pharmacy_id in pharmacy_ids:
+                    self._advance_pharmacy_number(pharmacy_id)
+                return client_ids
 
-            except Exception:
-                # Fallback: use timestamp-based ID
-                return datetime.now().strftime("%Y%m%d%H%M%S")
+            except Exception as e:
+                session.rollback()
+                if generated_id:
+                    self._reset_pharmacy_number()
+                logger.error(f"Failed to bulk upsert clients: {e}")
+                return {}
 
     def search_clients(self, search_term: str, limit: int = 50) -> List[Client]:
         """Search clients by name or pharmacy ID"""
         with self.db_manager.get_session() as session:
             try:
-                search_term = f"%{search_term}%"
                 return session.query(Client).filter(
                     Client.is_active == True,
-                    (Client.client_name.ilike(search_term) |
-                     Client.client_pharmacy_id.like(search_term))
+                    _client_search_filter(search_term)
                 ).limit(limit).all()
 
             except Exception as e:
                 logger.error(f"Failed to search clients: {e}")
                 return []
 
-    def get_by_pharmacy_id(self, pharmacy_id: str) -> Optional[Client]:
-        """Get client by pharmacy ID"""
+    def _client_summary_query(self, session: Session, *columns, search_term: Optional[str] = None):
+        """Build the active-client query used by list views"""
+        query = session.query(*columns).filter(Client.is_active == True)
+
+        if search_term:
+            query = query.filter(_client_search_filter(search_term))
+
+        return query
+
+    def get_client_summaries(self, search_term: Optional[str] = None, after_id: Optional[int] = None,
+                             limit: Optional[int] = None) -> List[Tuple[int, str, str]]:
+        """Get a page of (id, pharmacy ID, name) rows for client lists without loading full entities"""
         with self.db_manager.get_session() as session:
             try:
-                return session.query(Client).filter(
-                    Client.client_pharmacy_id == pharmacy_id,
+                query = self._client_summary_query(
+                    session, Client.id, Client.client_pharmacy_id, Client.client_name,
+                    search_term=search_term
+                )
+
+                # Keyset paging: seek past the last id seen instead of counting off skipped rows
+                if after_id is not None:
+                    query = query.filter(Client.id > after_id)
+                query = query.order_by(Client.id)
+
+                if limit is not None:
+                    query = query.limit(limit)
+
+                return [tuple(row) for row in query.all()]
+
+            except Exception as e:
+                logger.error(f"Failed to get client summaries: {e}")
+                return []
+
+    def count_client_summaries(self, search_term: Optional[str] = None) -> int:
+        """Count the rows get_client_summaries would return"""
+        with self.db_manager.get_session() as session:
+            try:
+                return self._client_summary_query(
+                    session, func.count(Client.id), search_term=search_term
+                ).scalar() or 0
+
+            except Exception as e:
+                logger.error(f"Failed to count client summaries: {e}")
+                return 0
+
+    def get_search_terms(self, prefix: str, limit: int = 20) -> List[str]:
+        """Get names and pharmacy IDs of up to limit clients matching prefix, for autocomplete"""
+        if not prefix.strip():
+            return []
+
+        with self.db_manager.get_session() as session:
+            try:
+                rows = session.query(
+                    Client.client_name, Client.client_pharmacy_id
+                ).filter(
+                    Client.is_active == True,
+                    _client_search_filter(prefix)
+                ).limit(limit).all()
+                return list(chain.from_iterable(rows))
+
+            except Exception as e:
+                logger.error(f"Failed to get client search terms: {e}")
+                return []
+
+    def get_client_with_note_rows(self, client_id: int, note_limit: int = 50
+                                  ) -> Tuple[Optional[Client], List[Tuple[date, str, str, str]]]:
+        """Load a client and its latest note rows in one session and transaction"""
+        with self.db_manager.get_session() as session:
+            try:
+                client = session.query(Client).filter(
+                    Client.id == client_id,
                     Client.is_active == True
                 ).first()
+                if client is None:
+                    return None, []
+
+                return client, _query_note_rows(session, client_id, note_limit)
+
+            except Exception as e:
+                logger.error(f"Failed to load client {client_id} with notes: {e}")
+                return None, []
+
+    def iter_client_rows(self, batch_size: int = 1000) -> Iterator[Tuple]:
+        """Stream active clients' profile columns, fetching batch_size rows at a time"""
+        with self.db_manager.get_session() as session:
+            query = session.query(*ClientRepository.PROFILE_COLUMNS).filter(
+                Client.is_active == True
+            ).order_by(Client.id).yield_per(batch_size)
+            yield from query
+
+    def get_client_profile(self, client_id: int) -> Optional[Dict[str, Any]]:
+        """Get the profile form columns of a client as a dict keyed by column name"""
+        with self.db_manager.get_session() as session:
+            try:
+                row = session.execute(self.PROFILE_QUERY, {"client_id": client_id}).first()
+                return dict(row._mapping) if row else None
+
+            except Exception as e:
+                logger.error(f"Failed to get client profile {client_id}: {e}")
+                return None
+
+    def get_by_pharmacy_id(self, pharmacy_id: str) -> Optional[Client]:
+        """Get client by pharmacy ID"""
+        with self.db_manager.get_session() as session:
+            try:
+                return session.execute(
+                    self.PHARMACY_ID_QUERY, {"pharmacy_id": pharmacy_id}
+                ).scalars().first()
             except Exception as e:
                 logger.error(f"Failed to get client by pharmacy ID: {e}")
                 return None
@@ -314,6 +643,23 @@ class ClientRepository(BaseRepository):
                 logger.error(f"Failed to get upcoming follow-ups: {e}")
                 return []
 
+    def get_upcoming_follow_up_rows(self, days_ahead: int = 7) -> List[Tuple[int, str, date]]:
+        """Get (id, name, follow-up date) rows for follow-ups in the next N days"""
+        with self.db_manager.get_session() as session:
+            try:
+                today = date.today()
+                # Range over the indexed follow_up_date; only the displayed columns are read
+                return [tuple(row) for row in session.query(
+                    Client.id, Client.client_name, Client.follow_up_date
+                ).filter(
+                    Client.follow_up_date.between(today, today + timedelta(days=days_ahead)),
+                    Client.is_active == True
+                ).order_by(Client.follow_up_date)]
+
+            except Exception as e:
+                logger.error(f"Failed to get upcoming follow-up rows: {e}")
+                return []
+
     def get_clients_by_criteria(self, criteria: Dict[str, Any]) -> List[Client]:
         """Get clients based on multiple criteria"""
         with self.db_manager.get_session() as session:
@@ -418,6 +764,35 @@ class ClientRepository(BaseRepository):
         except Exception as e:
             raise ValueError(f"Failed to update client: {str(e)}")
 
+    def complete_follow_up(self, client_id: int, note_content: Optional[str] = None) -> bool:
+        """Record a completed visit and its note in a single transaction"""
+        with self.db_manager.get_write_session() as session:
+            try:
+                client = session.query(Client).filter(
+                    Client.id == client_id,
+                    Client.is_active == True
+                ).first()
+                if not client:
+                    return False
+
+                client.update_last_visit()
+                client.follow_up_date = None
+                if note_content:
+                    session.add(ClientNote(
+                        client_id=client_id,
+                        content=note_content,
+                        note_type='follow_up'
+                    ))
+
+                # Visit update and note commit together, so the save syncs to disk once
+                session.commit()
+                return True
+
+            except Exception as e:
+                session.rollback()
+                logger.error(f"Failed to complete follow-up: {e}")
+                return False
+
 
 class ClientNoteRepository(BaseRepository):
     """
@@ -445,6 +820,16 @@ class ClientNoteRepository(BaseRepository):
                 logger.error(f"Failed to get notes for client {client_id}: {e}")
                 return []
 
+    def get_note_rows(self, client_id: int, limit: int = 50) -> List[Tuple[date, str, str, str]]:
+        """Get (date, type, title, content) rows of a client's latest notes"""
+        with self.db_manager.get_session() as session:
+            try:
+                return _query_note_rows(session, client_id, limit)
+
+            except Exception as e:
+                logger.error(f"Failed to get note rows for client {client_id}: {e}")
+                return []
+
     def create_note(self, client_id: int, content: str, **kwargs) -> Optional[ClientNote]:
         """Create a new note for a client"""
         try:
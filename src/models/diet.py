@@ -3,14 +3,17 @@ Diet Model
 Defines the nutrition and diet tracking data model for the Pharmacy Management System
 """
 
+import bisect
 from datetime import datetime, date
 from typing import Optional, List, Dict, Any, Tuple
-from sqlalchemy import Column, Integer, String, Text, Date, Boolean, Float, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, Text, Date, Boolean, Float, DateTime, ForeignKey, Index, select, bindparam
 from sqlalchemy.orm import relationship, Session
 from sqlalchemy.ext.hybrid import hybrid_property
 from enum import Enum
+from loguru import logger
 
 from .base import BaseModel, BaseRepository, get_database_manager
+from utils import BMI_THRESHOLDS, calculate_bmi as compute_bmi
 
 
 class WeightCategory(str, Enum):
@@ -39,6 +42,83 @@ class BMICategory(str, Enum):
     OBESE_CLASS_3 = "سمنة مفرطة"
 
 
+# BMI categories in the order of the shared utils.BMI_THRESHOLDS bins
+_BMI_CATEGORY_BINS = tuple(BMICategory)
+
+# Upper BMI bounds of the recommendation bands, searched with bisect_right
+_DIET_BMI_THRESHOLDS = (18.5, 25.0, 30.0)
+
+_EMPTY_DIET_RECOMMENDATIONS = {
+    'suggestions': '',
+    'advice': '',
+    'foods_to_include': '',
+    'foods_to_avoid': ''
+}
+
+# Recommendations per band: underweight, normal, overweight, obese
+_DIET_RECOMMENDATIONS = (
+    {
+        'suggestions': (
+            "• زيادة السعرات الحرارية بشكل معتدل\n"
+            "• تناول وجبات صغيرة متكررة\n"
+            "• التركيز على البروتينات الصحية\n"
+            "• تناول المكسرات والأفوكادو"
+        ),
+        'advice': (
+            "• من المهم زيادة الوزن بشكل صحي\n"
+            "• استشر أخصائي تغذية لتخطيط نظام غذائي مناسب"
+        ),
+        'foods_to_include': (
+            "البروتينات: اللحوم، الأسماك، البيض، البقوليات\n"
+            "الكربوهيدرات: الأرز البني، الخبز الكامل، الشوفان\n"
+            "الدهون الصحية: المكسرات، الأفوكادو، زيت الزيتون"
+        ),
+        'foods_to_avoid': ''
+    },
+    {
+        'suggestions': (
+            "• الحفاظ على نظام غذائي متوازن\n"
+            "• تناول الفواكه والخضروات بكميات كافية\n"
+            "• ممارسة الرياضة بانتظام"
+        ),
+        'advice': (
+            "• حافظ على وزنك الحالي من خلال اتباع نمط حياة صحي\n"
+            "• متابعة الفحوصات الدورية لضمان الصحة العامة"
+        ),
+        'foods_to_include': '',
+        'foods_to_avoid': ''
+    },
+    {
+        'suggestions': (
+            "• تقليل تناول الدهون المشبعة والسكريات\n"
+            "• زيادة تناول الألياف والخضروات\n"
+            "• ممارسة التمارين الرياضية بانتظام"
+        ),
+        'advice': (
+            "• العمل على فقدان الوزن الزائد لتحسين الصحة\n"
+            "• استشر أخصائي تغذية لوضع خطة غذائية مناسبة"
+        ),
+        'foods_to_include': '',
+        'foods_to_avoid': (
+            "الأطعمة المقلية، الحلويات، المشروبات الغازية\n"
+            "الوجبات السريعة، الأطعمة المصنعة"
+        )
+    },
+    {
+        'suggestions': (
+            "• اتباع نظام غذائي منخفض السعرات والدهون\n"
+            "• زيادة النشاط البدني بشكل منتظم\n"
+            "• تناول وجبات متوازنة تحتوي على البروتين والخضروات"
+        ),
+        'advice': (
+            "• من الضروري فقدان الوزن لتقليل مخاطر الأمراض المزمنة\n"
+            "• استشر طبيب أو أخصائي تغذية لوضع خطة شاملة"
+        ),
+        'foods_to_include': '',
+        'foods_to_avoid': ''
+    }
+)
+
 class ActivityLevel(str, Enum):
     """Physical activity level enumeration"""
     SEDENTARY = "قليل الحركة"
@@ -116,6 +196,12 @@ class DietRecord(BaseModel):
     client = relationship("Client", back_populates="diet_records")
     meal_plans = relationship("MealPlan", back_populates="diet_record", cascade="all, delete-orphan")
 
+    # Serves "latest records for a client" as a backward index range scan instead of a sort;
+    # the trailing columns let the latest-weight lookup be answered from the index alone
+    __table_args__ = (
+        Index("ix_diet_records_client_created_weight", "client_id", "created_at", "is_active", "current_weight"),
+    )
+
     @hybrid_property
     def weight_change(self) -> Optional[float]:
         """Calculate weight change from previous measurement"""
@@ -149,13 +235,13 @@ class DietRecord(BaseModel):
 
     def calculate_bmi(self) -> Optional[float]:
         """Calculate BMI from height and weight"""
-        if self.height and self.current_weight and self.height > 0:
-            height_m = self.height / 100  # Convert cm to meters
-            bmi = self.current_weight / (height_m ** 2)
-            self.bmi = round(bmi, 2)
-            self.bmi_category = self._get_bmi_category(self.bmi)
-            return self.bmi
-        return None
+        bmi = compute_bmi(self.current_weight, self.height)
+        if bmi is None:
+            return None
+
+        self.bmi = bmi
+        self.bmi_category = self._get_bmi_category(bmi)
+        return bmi
 
     def calculate_bmr(self, gender: str = 'male', age: int = 30) -> Optional[float]:
         """Calculate Basal Metabolic Rate using Mifflin-St Jeor equation"""
@@ -188,86 +274,14 @@ class DietRecord(BaseModel):
 
     def _get_bmi_category(self, bmi: float) -> str:
         """Get BMI category based on BMI value"""
-        if bmi < 18.5:
-            return BMICategory.UNDERWEIGHT
-        elif 18.5 <= bmi < 25:
-            return BMICategory.NORMAL
-        elif 25 <= bmi < 30:
-            return BMICategory.OVERWEIGHT
-        elif 30 <= bmi < 35:
-            return BMICategory.OBESE_CLASS_1
-        elif 35 <= bmi < 40:
-            return BMICategory.OBESE_CLASS_2
-        else:
-            return BMICategory.OBESE_CLASS_3
+        return _BMI_CATEGORY_BINS[bisect.bisect_right(BMI_THRESHOLDS, bmi)]
 
     def get_diet_recommendations(self) -> Dict[str, str]:
         """Get diet recommendations based on BMI and goals"""
-        recommendations = {
-            'suggestions': '',
-            'advice': '',
-            'foods_to_include': '',
-            'foods_to_avoid': ''
-        }
-
         if not self.bmi:
-            return recommendations
-
-        if self.bmi < 18.5:
-            recommendations['suggestions'] = (
-                "• زيادة السعرات الحرارية بشكل معتدل\n"
-                "• تناول وجبات صغيرة متكررة\n"
-                "• التركيز على البروتينات الصحية\n"
-                "• تناول المكسرات والأفوكادو"
-            )
-            recommendations['advice'] = (
-                "• من المهم زيادة الوزن بشكل صحي\n"
-                "• استشر أخصائي تغذية لتخطيط نظام غذائي مناسب"
-            )
-            recommendations['foods_to_include'] = (
-                "البروتينات: اللحوم، الأسماك، البيض، البقوليات\n"
-                "الكربوهيدرات: الأرز البني، الخبز الكامل، الشوفان\n"
-                "الدهون الصحية: المكسرات، الأفوكادو، زيت الزيتون"
-            )
-
-        elif 18.5 <= self.bmi < 25:
-            recommendations['suggestions'] = (
-                "• الحفاظ على نظام غذائي متوازن\n"
-                "• تناول الفواكه والخضروات بكميات كافية\n"
-                "• ممارسة الرياضة بانتظام"
-            )
-            recommendations['advice'] = (
-                "• حافظ على وزنك الحالي من خلال اتباع نمط حياة صحي\n"
-                "• متابعة الفحوصات الدورية لضمان الصحة العامة"
-            )
-
-        elif 25 <= self.bmi < 30:
-            recommendations['suggestions'] = (
-                "• تقليل تناول الدهون المشبعة والسكريات\n"
-                "• زيادة تناول الألياف والخضروات\n"
-                "• ممارسة التمارين الرياضية بانتظام"
-            )
-            recommendations['advice'] = (
-                "• العمل على فقدان الوزن الزائد لتحسين الصحة\n"
-                "• استشر أخصائي تغذية لوضع خطة غذائية مناسبة"
-            )
-            recommendations['foods_to_avoid'] = (
-                "الأطعمة المقلية، الحلويات، المشروبات الغازية\n"
-                "الوجبات السريعة، الأطعمة المصنعة"
-            )
-
-        else:  # BMI >= 30
-            recommendations['suggestions'] = (
-                "• اتباع نظام غذائي منخفض السعرات والدهون\n"
-                "• زيادة النشاط البدني بشكل منتظم\n"
-                "• تناول وجبات متوازنة تحتوي على البروتين والخضروات"
-            )
-            recommendations['advice'] = (
-                "• من الضروري فقدان الوزن لتقليل مخاطر الأمراض المزمنة\n"
-                "• استشر طبيب أو أخصائي تغذية لوضع خطة شاملة"
-            )
-
-        return recommendations
+            return dict(_EMPTY_DIET_RECOMMENDATIONS)
+
+        return dict(_DIET_RECOMMENDATIONS[bisect.bisect_right(_DIET_BMI_THRESHOLDS, self.bmi)])
 
     def to_dict(self) -> Dict[str, Any]:
         """Convert diet record to dictionary with calculated fields"""
@@ -368,6 +382,16 @@ class DietRepository(BaseRepository):
     Repository class for diet record operations
     """
 
+    # Built once; served by ix_diet_records_client_created_weight, each call only binds client_id
+    LATEST_RECORD_QUERY = select(DietRecord).where(
+        DietRecord.client_id == bindparam("client_id"),
+        DietRecord.is_active == True
+    ).order_by(DietRecord.created_at.desc()).limit(1)
+    LATEST_WEIGHT_QUERY = select(DietRecord.current_weight).where(
+        DietRecord.client_id == bindparam("client_id"),
+        DietRecord.is_active == True
+    ).order_by(DietRecord.created_at.desc()).limit(1)
+
     def __init__(self):
         super().__init__(get_database_manager(), DietRecord)
 
@@ -378,39 +402,53 @@ class DietRepository(BaseRepository):
 
             # Get previous weight if not provided
             if 'previous_weight' not in kwargs:
-                latest_record = self.get_latest_for_client(client_id)
-                if latest_record and latest_record.current_weight:
-                    kwargs['previous_weight'] = latest_record.current_weight
-
-            diet_record = self.create(**kwargs)
-
-            # Calculate BMI and other metrics
-            if diet_record.height and diet_record.current_weight:
-                diet_record.calculate_bmi()
+                latest_weight = self.get_latest_weight(client_id)
+                if latest_weight:
+                    kwargs['previous_weight'] = latest_weight
 
-            # Update the record
-            self.update(diet_record.id,
-                       bmi=diet_record.bmi,
-                       bmi_category=diet_record.bmi_category)
+            # Calculate BMI before inserting, so the record is written in one transaction
+            pending_record = DietRecord(**kwargs)
+            if pending_record.height and pending_record.current_weight and pending_record.calculate_bmi():
+                kwargs['bmi'] = pending_record.bmi
+                kwargs['bmi_category'] = pending_record.bmi_category
 
-            return diet_record
+            return self.create(**kwargs)
 
         except Exception as e:
             raise ValueError(f"Failed to create diet record: {str(e)}")
 
+    def bulk_create_diet_records(self, rows: List[Dict[str, Any]]) -> List[int]:
+        """Create many diet records, with BMI filled in, in one transaction; returns ids in input order"""
+        diet_records = [DietRecord(**row) for row in rows]
+        for diet_record in diet_records:
+            if diet_record.height and diet_record.current_weight:
+                diet_record.calculate_bmi()
+        return self.bulk_create_instances(diet_records)
+
     def get_latest_for_client(self, client_id: int) -> Optional[DietRecord]:
         """Get the latest diet record for a client"""
         with self.db_manager.get_session() as session:
             try:
-                return session.query(DietRecord).filter(
-                    DietRecord.client_id == client_id,
-                    DietRecord.is_active == True
-                ).order_by(DietRecord.created_at.desc()).first()
+                return session.execute(
+                    self.LATEST_RECORD_QUERY, {"client_id": client_id}
+                ).scalars().first()
 
             except Exception as e:
                 self.logger.error(f"Failed to get latest diet record: {e}")
                 return None
 
+    def get_latest_weight(self, client_id: int) -> Optional[float]:
+        """Get the weight from a client's latest diet record without loading the record"""
+        with self.db_manager.get_session() as session:
+            try:
+                return session.execute(
+                    self.LATEST_WEIGHT_QUERY, {"client_id": client_id}
+                ).scalar()
+
+            except Exception as e:
+                logger.error(f"Failed to get latest weight: {e}")
+                return None
+
     def get_records_for_client(self, client_id: int, limit: int = 10) -> List[DietRecord]:
         """Get diet records for a client"""
         with self.db_manager.get_session() as session:
@@ -501,6 +539,41 @@ class MealPlanRepository(BaseRepository):
         except Exception as e:
             raise ValueError(f"Failed to create meal plan: {str(e)}")
 
+    def save_day_plan(self, client_id: int, meal_date: date, meals: Dict[str, str],
+                      notes: Optional[str] = None) -> Optional[int]:
+        """Create or update the meal plan for a client's day under their latest diet record"""
+        with self.db_manager.get_write_session() as session:
+            try:
+                diet_record_id = session.execute(
+                    select(DietRecord.id).where(
+                        DietRecord.client_id == client_id,
+                        DietRecord.is_active == True
+                    ).order_by(DietRecord.created_at.desc()).limit(1)
+                ).scalar()
+                if diet_record_id is None:
+                    return None
+
+                meal_plan = session.execute(
+                    select(MealPlan).where(
+                        MealPlan.diet_record_id == diet_record_id,
+                        MealPlan.meal_date == meal_date,
+                        MealPlan.is_active == True
+                    ).limit(1)
+                ).scalars().first()
+                if meal_plan is None:
+                    meal_plan = MealPlan(diet_record_id=diet_record_id, meal_date=meal_date)
+                    session.add(meal_plan)
+
+                meal_plan.update_meals(meals)
+                meal_plan.notes = notes
+                session.commit()
+                return meal_plan.id
+
+            except Exception as e:
+                session.rollback()
+                logger.error(f"Failed to save meal plan: {e}")
+                return None
+
     def get_meal_plans_for_diet_record(self, diet_record_id: int) -> List[MealPlan]:
         """Get meal plans for a diet record"""
         with self.db_manager.get_session() as session:
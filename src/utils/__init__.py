@@ -17,7 +17,10 @@ without containing business logic or UI components.
 """
 
 from typing import Any, Optional, Dict, List, Callable
+from functools import lru_cache
 import re
+import bisect
+import time
 from datetime import datetime, date
 
 # Import validators
@@ -140,6 +143,19 @@ def format_datetime(datetime_obj: Any, format_str: str = DEFAULT_DATETIME_FORMAT
     except Exception:
         return str(datetime_obj) if datetime_obj else ""
 
+@lru_cache(maxsize=4096)
+def _reshape_arabic_text(text: str) -> str:
+    """Reshape and reorder Arabic text; results are memoized since UI strings repeat"""
+    # Try to import Arabic text processing libraries
+    try:
+        import arabic_reshaper
+        from bidi.algorithm import get_display
+    except ImportError:
+        # Fallback to original text if libraries not available
+        return text
+
+    return get_display(arabic_reshaper.reshape(text))
+
 def format_arabic_text(text: str) -> str:
     """
     Format Arabic text for proper display
@@ -154,18 +170,7 @@ def format_arabic_text(text: str) -> str:
         if not text:
             return ""
 
-        # Try to import Arabic text processing libraries
-        try:
-            import arabic_reshaper
-            from bidi.algorithm import get_display
-
-            reshaped_text = arabic_reshaper.reshape(text)
-            bidi_text = get_display(reshaped_text)
-            return bidi_text
-
-        except ImportError:
-            # Fallback to original text if libraries not available
-            return text
+        return _reshape_arabic_text(text)
 
     except Exception:
         return text
@@ -332,6 +337,17 @@ def calculate_bmi(weight: float, height: float) -> Optional[float]:
     except (ValueError, TypeError, ZeroDivisionError):
         return None
 
+# Upper bounds of each BMI category; a value equal to a bound falls in the next one
+BMI_THRESHOLDS = (18.5, 25.0, 30.0, 35.0, 40.0)
+BMI_CATEGORIES_AR = (
+    "نقص الوزن",
+    "طبيعي",
+    "زيادة الوزن",
+    "سمنة درجة أولى",
+    "سمنة درجة ثانية",
+    "سمنة مفرطة",
+)
+
 def get_bmi_category(bmi: float) -> str:
     """
     Get BMI category in Arabic
@@ -342,18 +358,7 @@ def get_bmi_category(bmi: float) -> str:
     Returns:
         str: BMI category in Arabic
     """
-    if bmi < 18.5:
-        return "نقص الوزن"
-    elif 18.5 <= bmi < 25:
-        return "طبيعي"
-    elif 25 <= bmi < 30:
-        return "زيادة الوزن"
-    elif 30 <= bmi < 35:
-        return "سمنة درجة أولى"
-    elif 35 <= bmi < 40:
-        return "سمنة درجة ثانية"
-    else:
-        return "سمنة مفرطة"
+    return BMI_CATEGORIES_AR[bisect.bisect_right(BMI_THRESHOLDS, bmi)]
 
 def retry_on_exception(max_retries: int = 3, delay: float = 1.0):
     """
@@ -368,8 +373,6 @@ def retry_on_exception(max_retries: int = 3, delay: float = 1.0):
     """
     def decorator(func: Callable):
         def wrapper(*args, **kwargs):
-            import time
-
             last_exception = None
             for attempt in range(max_retries + 1):
                 try:
@@ -398,8 +401,6 @@ def cache_result(ttl_seconds: int = 300):
         cache = {}
 
         def wrapper(*args, **kwargs):
-            import time
-
             # Create cache key
             key = str(args) + str(sorted(kwargs.items()))
 
@@ -4,14 +4,28 @@ Manages application resources like fonts, icons, images, and stylesheets
 """
 
 import os
+import shutil
 import sys
 from pathlib import Path
-from typing import Optional, Dict, Any
-from PyQt6.QtGui import QIcon, QPixmap, QFont
-from PyQt6.QtCore import QFile, QTextStream
+from typing import Optional, Dict, Any, Tuple, List, Iterable
+from PyQt6.QtGui import QIcon, QPixmap, QFont, QFontDatabase
+from PyQt6.QtCore import QDir, QFile, QIODevice, QStringConverter, QTextStream
 from loguru import logger
 
 
+# Stylesheet contents shared by all ResourceManager instances: path -> (mtime_ns, content)
+_stylesheet_cache: Dict[str, Tuple[int, str]] = {}
+
+# Font families registered with Qt, which is process-wide: font file name -> family
+_font_families: Dict[str, str] = {}
+
+# Fonts embedded in PDF reports as (font file, CSS weight); reports fall back to system fonts without them
+REPORT_FONTS = (
+    ("NotoSansArabic-Regular.ttf", "normal"),
+    ("NotoSansArabic-Bold.ttf", "bold"),
+)
+
+
 class ResourceManager:
     """
     Manages application resources and provides centralized access to assets
@@ -20,7 +34,6 @@ class ResourceManager:
     def __init__(self):
         self.base_path = self._get_base_path()
         self.resources_path = self.base_path / "resources"
-        self._cached_stylesheets: Dict[str, str] = {}
         self._cached_icons: Dict[str, QIcon] = {}
         self._cached_fonts: Dict[str, QFont] = {}
 
@@ -28,6 +41,10 @@ class ResourceManager:
         if not self.resources_path.exists():
             logger.warning(f"Resources directory not found: {self.resources_path}")
 
+        # Expose resource folders to Qt as "styles:", "icons:", "fonts:" ... prefixes
+        for prefix in ("styles", "icons", "fonts", "images", "templates"):
+            QDir.setSearchPaths(prefix, [str(self.resources_path / prefix)])
+
     def _get_base_path(self) -> Path:
         """
         Get the base path for resources, handling both development and packaged environments
@@ -130,21 +147,31 @@ class ResourceManager:
         Returns:
             str: Stylesheet content if successful, None otherwise
         """
-        # Check cache first
-        if use_cache and style_name in self._cached_stylesheets:
-            return self._cached_stylesheets[style_name]
-
         style_path = self.get_style_path(style_name)
         if not style_path:
             return None
 
         try:
-            with open(style_path, 'r', encoding='utf-8') as file:
-                content = file.read()
+            # Reuse the cached content while the file is unchanged on disk
+            mtime_ns = os.stat(style_path).st_mtime_ns
+            cached = _stylesheet_cache.get(style_path)
+            if use_cache and cached and cached[0] == mtime_ns:
+                return cached[1]
+
+            style_file = QFile(f"styles:{style_name}")
+            if not style_file.open(QIODevice.OpenModeFlag.ReadOnly | QIODevice.OpenModeFlag.Text):
+                raise IOError(style_file.errorString())
+
+            try:
+                stream = QTextStream(style_file)
+                stream.setEncoding(QStringConverter.Encoding.Utf8)
+                content = stream.readAll()
+            finally:
+                style_file.close()
 
             # Cache the content
             if use_cache:
-                self._cached_stylesheets[style_name] = content
+                _stylesheet_cache[style_path] = (mtime_ns, content)
 
             return content
 
@@ -232,26 +259,43 @@ class ResourceManager:
         if use_cache and cache_key in self._cached_fonts:
             return self._cached_fonts[cache_key]
 
+        font_family = self.register_font(font_name)
+        if not font_family:
+            return None
+
+        font = QFont(font_family, size)
+
+        # Cache the font
+        if use_cache:
+            self._cached_fonts[cache_key] = font
+
+        return font
+
+    def register_font(self, font_name: str) -> Optional[str]:
+        """
+        Register a font file with Qt once and get its family name
+
+        Args:
+            font_name: Font file name
+
+        Returns:
+            str: Font family name if successful, None otherwise
+        """
+        if font_name in _font_families:
+            return _font_families[font_name]
+
         font_path = self.get_font_path(font_name)
         if not font_path:
             return None
 
         try:
-            from PyQt6.QtGui import QFontDatabase
-
-            font_db = QFontDatabase()
-            font_id = font_db.addApplicationFont(font_path)
+            font_id = QFontDatabase.addApplicationFont(font_path)
 
             if font_id != -1:
-                font_families = font_db.applicationFontFamilies(font_id)
+                font_families = QFontDatabase.applicationFontFamilies(font_id)
                 if font_families:
-                    font = QFont(font_families[0], size)
-
-                    # Cache the font
-                    if use_cache:
-                        self._cached_fonts[cache_key] = font
-
-                    return font
+                    _font_families[font_name] = font_families[0]
+                    return font_families[0]
 
             logger.warning(f"Failed to register font: {font_name}")
             return None
@@ -260,6 +304,21 @@ class ResourceManager:
             logger.error(f"Error loading font {font_name}: {e}")
             return None
 
+    def validate_fonts(self, font_names: Iterable[str]) -> List[str]:
+        """
+        Check that font files are present, warning about missing ones
+
+        Args:
+            font_names: Font file names to check
+
+        Returns:
+            list: Names of missing fonts
+        """
+        missing_fonts = [name for name in font_names if not self.get_font_path(name)]
+        if missing_fonts:
+            logger.warning(f"Fonts missing, using system fonts instead: {', '.join(missing_fonts)}")
+        return missing_fonts
+
     def load_template(self, template_name: str) -> Optional[str]:
         """
         Load template content from file
@@ -334,7 +393,7 @@ class ResourceManager:
 
     def clear_cache(self):
         """Clear all cached resources"""
-        self._cached_stylesheets.clear()
+        _stylesheet_cache.clear()
         self._cached_icons.clear()
         self._cached_fonts.clear()
         logger.info("Resource cache cleared")
@@ -393,7 +452,6 @@ class ResourceManager:
                     new_path.parent.mkdir(parents=True, exist_ok=True)
 
                     # Copy file
-                    import shutil
                     shutil.copy2(old_path, new_path)
                     logger.info(f"Copied resource: {old_file} -> {new_file}")
 
@@ -6,7 +6,8 @@ for the Pharmacy Management Application. It integrates all widgets, handles
 navigation, and manages the overall application state.
 """
 
-from typing import Optional, Dict, Any, List
+from functools import lru_cache
+from typing import Optional, Dict, Any, List, Callable
 from datetime import datetime
 from PyQt6.QtWidgets import (
     QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
@@ -38,6 +39,159 @@ from config.settings import AppSettings
 from utils.resource_manager import ResourceManager
 
 
+# Window stylesheets per theme, built once at import
+LIGHT_THEME_STYLESHEET = """
+    QMainWindow {
+        background-color: #f5f5f5;
+        color: #333333;
+    }
+
+    QTabWidget::pane {
+        border: 1px solid #cccccc;
+        background-color: white;
+    }
+
+    QTabBar::tab {
+        background-color: #e0e0e0;
+        border: 1px solid #cccccc;
+        border-bottom: none;
+        padding: 8px 16px;
+        margin-right: 2px;
+    }
+
+    QTabBar::tab:selected {
+        background-color: white;
+        border-bottom: 1px solid white;
+    }
+
+    QTabBar::tab:hover {
+        background-color: #f0f0f0;
+    }
+
+    QToolBar {
+        background-color: #ffffff;
+        border: 1px solid #e0e0e0;
+        spacing: 8px;
+        padding: 4px;
+    }
+
+    QStatusBar {
+        background-color: #f8f8f8;
+        border-top: 1px solid #e0e0e0;
+    }
+
+    QPushButton {
+        background-color: #2196F3;
+        color: white;
+        border: none;
+        border-radius: 4px;
+        padding: 6px 12px;
+        font-weight: 500;
+    }
+
+    QPushButton:hover {
+        background-color: #1976D2;
+    }
+
+    QPushButton:pressed {
+        background-color: #0D47A1;
+    }
+
+    QLineEdit {
+        border: 1px solid #cccccc;
+        border-radius: 4px;
+        padding: 4px 8px;
+        background-color: white;
+    }
+
+    QLineEdit:focus {
+        border: 2px solid #2196F3;
+    }
+"""
+
+DARK_THEME_STYLESHEET = """
+    QMainWindow {
+        background-color: #2b2b2b;
+        color: #ffffff;
+    }
+
+    QTabWidget::pane {
+        border: 1px solid #555555;
+        background-color: #3c3c3c;
+    }
+
+    QTabBar::tab {
+        background-color: #404040;
+        border: 1px solid #555555;
+        border-bottom: none;
+        padding: 8px 16px;
+        margin-right: 2px;
+        color: #ffffff;
+    }
+
+    QTabBar::tab:selected {
+        background-color: #3c3c3c;
+        border-bottom: 1px solid #3c3c3c;
+    }
+
+    QTabBar::tab:hover {
+        background-color: #4a4a4a;
+    }
+
+    QToolBar {
+        background-color: #333333;
+        border: 1px solid #555555;
+        color: #ffffff;
+    }
+
+    QStatusBar {
+        background-color: #2a2a2a;
+        border-top: 1px solid #555555;
+        color: #ffffff;
+    }
+
+    QPushButton {
+        background-color: #2196F3;
+        color: white;
+        border: none;
+        border-radius: 4px;
+        padding: 6px 12px;
+        font-weight: 500;
+    }
+
+    QPushButton:hover {
+        background-color: #1976D2;
+    }
+
+    QLineEdit {
+        border: 1px solid #666666;
+        border-radius: 4px;
+        padding: 4px 8px;
+        background-color: #404040;
+        color: #ffffff;
+    }
+
+    QLineEdit:focus {
+        border: 2px solid #2196F3;
+    }
+
+    QLabel {
+        color: #ffffff;
+    }
+"""
+
+THEME_STYLESHEETS = {
+    'light': LIGHT_THEME_STYLESHEET,
+    'dark': DARK_THEME_STYLESHEET,
+}
+
+
+@lru_cache(maxsize=64)
+def _icon(name: str) -> QIcon:
+    """Get the shared QIcon for a bundled icon, so each PNG is loaded and decoded once."""
+    return QIcon(f":/icons/{name}.png")
+
+
 class MainWindow(QMainWindow):
     """
     Main application window providing the primary user interface.
@@ -79,6 +233,7 @@ class MainWindow(QMainWindow):
         self.current_client_id = None
         self.current_language = self.settings.get('ui.language', 'ar')
         self.current_theme = self.settings.get('ui.theme', 'light')
+        self._applied_theme: Optional[str] = None
         self.is_rtl = self.current_language == 'ar'
 
         # UI components
@@ -87,6 +242,7 @@ class MainWindow(QMainWindow):
         self.dashboard_widget = None
         self.client_widget = None
         self.diet_widget = None
+        self._lazy_tabs: Dict[QWidget, Callable[[], QWidget]] = {}
         self.menu_bar = None
         self.tool_bar = None
         self.status_bar = None
@@ -140,14 +296,10 @@ class MainWindow(QMainWindow):
                 y = (screen_geometry.height() - self.height()) // 2
                 self.move(x, y)
 
-        # Set layout direction
-        if self.is_rtl:
-            self.setLayoutDirection(Qt.LayoutDirection.RightToLeft)
-        else:
-            self.setLayoutDirection(Qt.LayoutDirection.LeftToRight)
+        # Layout direction is inherited from the application
 
         # Set window icon
-        self.setWindowIcon(QIcon(":/icons/pharmacy.png"))
+        self.setWindowIcon(_icon("pharmacy"))
 
     def _create_menu_bar(self):
         """Create the application menu bar."""
@@ -159,14 +311,14 @@ class MainWindow(QMainWindow):
         # New Client
         new_client_action = QAction("عميل جديد" if self.is_rtl else "New Client", self)
         new_client_action.setShortcut(QKeySequence.StandardKey.New)
-        new_client_action.setIcon(QIcon(":/icons/user_add.png"))
+        new_client_action.setIcon(_icon("user_add"))
         new_client_action.triggered.connect(self._new_client)
         file_menu.addAction(new_client_action)
 
         # Open Client
         open_client_action = QAction("فتح عميل" if self.is_rtl else "Open Client", self)
         open_client_action.setShortcut(QKeySequence.StandardKey.Open)
-        open_client_action.setIcon(QIcon(":/icons/user_open.png"))
+        open_client_action.setIcon(_icon("user_open"))
         open_client_action.triggered.connect(self._open_client)
         file_menu.addAction(open_client_action)
 
@@ -174,13 +326,13 @@ class MainWindow(QMainWindow):
 
         # Import Data
         import_action = QAction("استيراد البيانات" if self.is_rtl else "Import Data", self)
-        import_action.setIcon(QIcon(":/icons/import.png"))
+        import_action.setIcon(_icon("import"))
         import_action.triggered.connect(self._import_data)
         file_menu.addAction(import_action)
 
         # Export Data
         export_action = QAction("تصدير البيانات" if self.is_rtl else "Export Data", self)
-        export_action.setIcon(QIcon(":/icons/export.png"))
+        export_action.setIcon(_icon("export"))
         export_action.triggered.connect(self._export_data)
         file_menu.addAction(export_action)
 
@@ -188,13 +340,13 @@ class MainWindow(QMainWindow):
 
         # Backup
         backup_action = QAction("نسخ احتياطي" if self.is_rtl else "Backup", self)
-        backup_action.setIcon(QIcon(":/icons/backup.png"))
+        backup_action.setIcon(_icon("backup"))
         backup_action.triggered.connect(self._create_backup)
         file_menu.addAction(backup_action)
 
         # Restore
         restore_action = QAction("استعادة" if self.is_rtl else "Restore", self)
-        restore_action.setIcon(QIcon(":/icons/restore.png"))
+        restore_action.setIcon(_icon("restore"))
         restore_action.triggered.connect(self._restore_backup)
         file_menu.addAction(restore_action)
 
@@ -203,7 +355,7 @@ class MainWindow(QMainWindow):
         # Exit
         exit_action = QAction("خروج" if self.is_rtl else "Exit", self)
         exit_action.setShortcut(QKeySequence.StandardKey.Quit)
-        exit_action.setIcon(QIcon(":/icons/exit.png"))
+        exit_action.setIcon(_icon("exit"))
         exit_action.triggered.connect(self.close)
         file_menu.addAction(exit_action)
 
@@ -213,13 +365,13 @@ class MainWindow(QMainWindow):
         # Undo
         undo_action = QAction("تراجع" if self.is_rtl else "Undo", self)
         undo_action.setShortcut(QKeySequence.StandardKey.Undo)
-        undo_action.setIcon(QIcon(":/icons/undo.png"))
+        undo_action.setIcon(_icon("undo"))
         edit_menu.addAction(undo_action)
 
         # Redo
         redo_action = QAction("إعادة" if self.is_rtl else "Redo", self)
         redo_action.setShortcut(QKeySequence.StandardKey.Redo)
-        redo_action.setIcon(QIcon(":/icons/redo.png"))
+        redo_action.setIcon(_icon("redo"))
         edit_menu.addAction(redo_action)
 
         edit_menu.addSeparator()
@@ -227,7 +379,7 @@ class MainWindow(QMainWindow):
         # Find
         find_action = QAction("بحث" if self.is_rtl else "Find", self)
         find_action.setShortcut(QKeySequence.StandardKey.Find)
-        find_action.setIcon(QIcon(":/icons/search.png"))
+        find_action.setIcon(_icon("search"))
         find_action.triggered.connect(self._focus_search)
         edit_menu.addAction(find_action)
 
@@ -236,7 +388,7 @@ class MainWindow(QMainWindow):
         # Preferences
         preferences_action = QAction("تفضيلات" if self.is_rtl else "Preferences", self)
         preferences_action.setShortcut(QKeySequence.StandardKey.Preferences)
-        preferences_action.setIcon(QIcon(":/icons/settings.png"))
+        preferences_action.setIcon(_icon("settings"))
         preferences_action.triggered.connect(self._show_settings)
         edit_menu.addAction(preferences_action)
 
@@ -288,19 +440,19 @@ class MainWindow(QMainWindow):
 
         # Client Report
         client_report_action = QAction("تقرير العميل" if self.is_rtl else "Client Report", self)
-        client_report_action.setIcon(QIcon(":/icons/report_client.png"))
+        client_report_action.setIcon(_icon("report_client"))
         client_report_action.triggered.connect(self._generate_client_report)
         reports_menu.addAction(client_report_action)
 
         # Nutrition Report
         nutrition_report_action = QAction("تقرير التغذية" if self.is_rtl else "Nutrition Report", self)
-        nutrition_report_action.setIcon(QIcon(":/icons/report_nutrition.png"))
+        nutrition_report_action.setIcon(_icon("report_nutrition"))
         nutrition_report_action.triggered.connect(self._generate_nutrition_report)
         reports_menu.addAction(nutrition_report_action)
 
         # Statistics Report
         stats_report_action = QAction("تقرير الإحصائيات" if self.is_rtl else "Statistics Report", self)
-        stats_report_action.setIcon(QIcon(":/icons/report_stats.png"))
+        stats_report_action.setIcon(_icon("report_stats"))
         stats_report_action.triggered.connect(self._generate_statistics_report)
         reports_menu.addAction(stats_report_action)
 
@@ -309,13 +461,13 @@ class MainWindow(QMainWindow):
 
         # BMI Calculator
         bmi_action = QAction("حاسبة مؤشر كتلة الجسم" if self.is_rtl else "BMI Calculator", self)
-        bmi_action.setIcon(QIcon(":/icons/calculator.png"))
+        bmi_action.setIcon(_icon("calculator"))
         bmi_action.triggered.connect(self._show_bmi_calculator)
         tools_menu.addAction(bmi_action)
 
         # Calorie Calculator
         calorie_action = QAction("حاسبة السعرات" if self.is_rtl else "Calorie Calculator", self)
-        calorie_action.setIcon(QIcon(":/icons/calories.png"))
+        calorie_action.setIcon(_icon("calories"))
         calorie_action.triggered.connect(self._show_calorie_calculator)
         tools_menu.addAction(calorie_action)
 
@@ -323,13 +475,13 @@ class MainWindow(QMainWindow):
 
         # User Management
         user_mgmt_action = QAction("إدارة المستخدمين" if self.is_rtl else "User Management", self)
-        user_mgmt_action.setIcon(QIcon(":/icons/users.png"))
+        user_mgmt_action.setIcon(_icon("users"))
         user_mgmt_action.triggered.connect(self._show_user_management)
         tools_menu.addAction(user_mgmt_action)
 
         # Database Maintenance
         db_maintenance_action = QAction("صيانة قاعدة البيانات" if self.is_rtl else "Database Maintenance", self)
-        db_maintenance_action.setIcon(QIcon(":/icons/database.png"))
+        db_maintenance_action.setIcon(_icon("database"))
         db_maintenance_action.triggered.connect(self._show_db_maintenance)
         tools_menu.addAction(db_maintenance_action)
 
@@ -339,7 +491,7 @@ class MainWindow(QMainWindow):
         # User Manual
         manual_action = QAction("دليل المستخدم" if self.is_rtl else "User Manual", self)
         manual_action.setShortcut(QKeySequence.StandardKey.HelpContents)
-        manual_action.setIcon(QIcon(":/icons/help.png"))
+        manual_action.setIcon(_icon("help"))
         manual_action.triggered.connect(self._show_help)
         help_menu.addAction(manual_action)
 
@@ -352,7 +504,7 @@ class MainWindow(QMainWindow):
 
         # Check for Updates
         update_action = QAction("التحقق من التحديثات" if self.is_rtl else "Check for Updates", self)
-        update_action.setIcon(QIcon(":/icons/update.png"))
+        update_action.setIcon(_icon("update"))
         update_action.triggered.connect(self._check_updates)
         help_menu.addAction(update_action)
 
@@ -383,17 +535,17 @@ class MainWindow(QMainWindow):
 
         # Quick actions
         new_client_btn = QPushButton("عميل جديد" if self.is_rtl else "New Client")
-        new_client_btn.setIcon(QIcon(":/icons/user_add.png"))
+        new_client_btn.setIcon(_icon("user_add"))
         new_client_btn.clicked.connect(self._new_client)
         self.tool_bar.addWidget(new_client_btn)
 
         new_diet_btn = QPushButton("خطة غذائية" if self.is_rtl else "Diet Plan")
-        new_diet_btn.setIcon(QIcon(":/icons/diet.png"))
+        new_diet_btn.setIcon(_icon("diet"))
         new_diet_btn.clicked.connect(self._new_diet_plan)
         self.tool_bar.addWidget(new_diet_btn)
 
         generate_report_btn = QPushButton("تقرير" if self.is_rtl else "Report")
-        generate_report_btn.setIcon(QIcon(":/icons/report.png"))
+        generate_report_btn.setIcon(_icon("report"))
         generate_report_btn.clicked.connect(self._quick_report)
         self.tool_bar.addWidget(generate_report_btn)
 
@@ -405,7 +557,7 @@ class MainWindow(QMainWindow):
 
         # Logout button
         self.logout_btn = QPushButton("تسجيل الخروج" if self.is_rtl else "Logout")
-        self.logout_btn.setIcon(QIcon(":/icons/logout.png"))
+        self.logout_btn.setIcon(_icon("logout"))
         self.logout_btn.clicked.connect(self._logout)
         self.logout_btn.setVisible(False)
         self.tool_bar.addWidget(self.logout_btn)
@@ -434,17 +586,13 @@ class MainWindow(QMainWindow):
             "لوحة المعلومات" if self.is_rtl else "Dashboard"
         )
 
-        # Client Management Tab
-        self.client_widget = ClientWidget()
-        self.tab_widget.addTab(
-            self.client_widget,
+        # Client Management and Diet & Nutrition tabs are built on first visit
+        self._add_lazy_tab(
+            self._build_client_widget,
             "إدارة العملاء" if self.is_rtl else "Client Management"
         )
-
-        # Diet & Nutrition Tab
-        self.diet_widget = DietWidget()
-        self.tab_widget.addTab(
-            self.diet_widget,
+        self._add_lazy_tab(
+            self._build_diet_widget,
             "التغذية والحمية" if self.is_rtl else "Diet & Nutrition"
         )
 
@@ -456,6 +604,48 @@ class MainWindow(QMainWindow):
         # Initially show main interface (will be hidden until login)
         self.central_stack.setCurrentWidget(main_widget)
 
+    def _add_lazy_tab(self, builder: Callable[[], QWidget], title: str):
+        """Add a placeholder tab that is replaced by builder() when first shown."""
+        placeholder = QWidget()
+        self._lazy_tabs[placeholder] = builder
+        self.tab_widget.addTab(placeholder, title)
+
+    def _ensure_tab_built(self, index: int):
+        """Swap a lazy tab's placeholder for its real widget."""
+        placeholder = self.tab_widget.widget(index)
+        builder = self._lazy_tabs.pop(placeholder, None)
+        if builder is None:
+            return
+
+        widget = builder()
+        title = self.tab_widget.tabText(index)
+
+        self.tab_widget.setUpdatesEnabled(False)
+        self.tab_widget.blockSignals(True)
+        self.tab_widget.removeTab(index)
+        self.tab_widget.insertTab(index, widget, title)
+        self.tab_widget.setCurrentIndex(index)
+        self.tab_widget.blockSignals(False)
+        self.tab_widget.setUpdatesEnabled(True)
+        placeholder.deleteLater()
+
+    def _build_client_widget(self) -> QWidget:
+        """Create the client management tab and connect its signals."""
+        self.client_widget = ClientWidget()
+        self.client_widget.client_selected.connect(self._select_client)
+        self.client_widget.client_saved.connect(self._on_client_saved)
+        self.client_widget.client_deleted.connect(self._on_client_deleted)
+        return self.client_widget
+
+    def _build_diet_widget(self) -> QWidget:
+        """Create the diet tab, connect its signals and show the selected client."""
+        self.diet_widget = DietWidget()
+        self.diet_widget.diet_record_saved.connect(self._on_diet_record_saved)
+        self.diet_widget.nutrition_calculated.connect(self._on_nutrition_calculated)
+        if self.current_client_id:
+            self.diet_widget.set_client(self.current_client_id)
+        return self.diet_widget
+
     def _create_status_bar(self):
         """Create the application status bar."""
         self.status_bar = self.statusBar()
@@ -487,154 +677,11 @@ class MainWindow(QMainWindow):
 
     def _apply_theme(self):
         """Apply the current theme to the application."""
-        if self.current_theme == 'dark':
-            self._apply_dark_theme()
-        else:
-            self._apply_light_theme()
-
-    def _apply_light_theme(self):
-        """Apply light theme styling."""
-        self.setStyleSheet("""
-            QMainWindow {
-                background-color: #f5f5f5;
-                color: #333333;
-            }
-
-            QTabWidget::pane {
-                border: 1px solid #cccccc;
-                background-color: white;
-            }
-
-            QTabBar::tab {
-                background-color: #e0e0e0;
-                border: 1px solid #cccccc;
-                border-bottom: none;
-                padding: 8px 16px;
-                margin-right: 2px;
-            }
-
-            QTabBar::tab:selected {
-                background-color: white;
-                border-bottom: 1px solid white;
-            }
-
-            QTabBar::tab:hover {
-                background-color: #f0f0f0;
-            }
-
-            QToolBar {
-                background-color: #ffffff;
-                border: 1px solid #e0e0e0;
-                spacing: 8px;
-                padding: 4px;
-            }
-
-            QStatusBar {
-                background-color: #f8f8f8;
-                border-top: 1px solid #e0e0e0;
-            }
-
-            QPushButton {
-                background-color: #2196F3;
-                color: white;
-                border: none;
-                border-radius: 4px;
-                padding: 6px 12px;
-                font-weight: 500;
-            }
-
-            QPushButton:hover {
-                background-color: #1976D2;
-            }
-
-            QPushButton:pressed {
-                background-color: #0D47A1;
-            }
-
-            QLineEdit {
-                border: 1px solid #cccccc;
-                border-radius: 4px;
-                padding: 4px 8px;
-                background-color: white;
-            }
-
-            QLineEdit:focus {
-                border: 2px solid #2196F3;
-            }
-        """)
-
-    def _apply_dark_theme(self):
-        """Apply dark theme styling."""
-        self.setStyleSheet("""
-            QMainWindow {
-                background-color: #2b2b2b;
-                color: #ffffff;
-            }
-
-            QTabWidget::pane {
-                border: 1px solid #555555;
-                background-color: #3c3c3c;
-            }
-
-            QTabBar::tab {
-                background-color: #404040;
-                border: 1px solid #555555;
-                border-bottom: none;
-                padding: 8px 16px;
-                margin-right: 2px;
-                color: #ffffff;
-            }
-
-            QTabBar::tab:selected {
-                background-color: #3c3c3c;
-                border-bottom: 1px solid #3c3c3c;
-            }
-
-            QTabBar::tab:hover {
-                background-color: #4a4a4a;
-            }
-
-            QToolBar {
-                background-color: #333333;
-                border: 1px solid #555555;
-                color: #ffffff;
-            }
-
-            QStatusBar {
-                background-color: #2a2a2a;
-                border-top: 1px solid #555555;
-                color: #ffffff;
-            }
-
-            QPushButton {
-                background-color: #2196F3;
-                color: white;
-                border: none;
-                border-radius: 4px;
-                padding: 6px 12px;
-                font-weight: 500;
-            }
-
-            QPushButton:hover {
-                background-color: #1976D2;
-            }
-
-            QLineEdit {
-                border: 1px solid #666666;
-                border-radius: 4px;
-                padding: 4px 8px;
-                background-color: #404040;
-                color: #ffffff;
-            }
-
-            QLineEdit:focus {
-                border: 2px solid #2196F3;
-            }
-
-            QLabel {
-                color: #ffffff;
-            }
-        """)
+        # Re-setting an identical stylesheet still makes Qt re-parse and re-polish every widget
+        if self.current_theme == self._applied_theme:
+            return
+        self.setStyleSheet(THEME_STYLESHEETS.get(self.current_theme, LIGHT_THEME_STYLESHEET))
+        self._applied_theme = self.current_theme
 
     def _setup_shortcuts(self):
         """Setup keyboard shortcuts."""
@@ -658,7 +705,7 @@ class MainWindow(QMainWindow):
             self.tray_icon = QSystemTrayIcon(self)
 
             # Try to set icon with fallback
-            icon = QIcon(":/icons/pharmacy.png")
+            icon = _icon("pharmacy")
             if icon.isNull():
                 # Create a simple fallback icon
                 from PyQt6.QtGui import QPixmap, QPainter, QBrush
@@ -697,16 +744,7 @@ class MainWindow(QMainWindow):
             self.dashboard_widget.quick_action_triggered.connect(self._handle_quick_action)
             self.dashboard_widget.client_selected.connect(self._select_client)
 
-        # Client widget signals
-        if self.client_widget:
-            self.client_widget.client_selected.connect(self._select_client)
-            self.client_widget.client_saved.connect(self._on_client_saved)
-            self.client_widget.client_deleted.connect(self._on_client_deleted)
-
-        # Diet widget signals
-        if self.diet_widget:
-            self.diet_widget.diet_record_saved.connect(self._on_diet_record_saved)
-            self.diet_widget.nutrition_calculated.connect(self._on_nutrition_calculated)
+        # Client and diet widget signals are connected when their tabs are built
 
     def _show_login_dialog(self):
         """Show the login dialog."""
@@ -837,11 +875,10 @@ class MainWindow(QMainWindow):
         self.is_rtl = language_code == 'ar'
         self.settings.set('ui.language', language_code)
 
-        # Update layout direction
-        if self.is_rtl:
-            self.setLayoutDirection(Qt.LayoutDirection.RightToLeft)
-        else:
-            self.setLayoutDirection(Qt.LayoutDirection.LeftToRight)
+        # Update layout direction application-wide so all windows and widgets follow
+        QApplication.instance().setLayoutDirection(
+            Qt.LayoutDirection.RightToLeft if self.is_rtl else Qt.LayoutDirection.LeftToRight
+        )
 
         self.language_changed.emit(language_code)
 
@@ -925,6 +962,8 @@ class MainWindow(QMainWindow):
 
     def _on_tab_changed(self, index: int):
         """Handle tab change."""
+        self._ensure_tab_built(index)
+
         # Refresh data in the new tab
         current_widget = self.tab_widget.currentWidget()
         if hasattr(current_widget, 'refresh_data'):
@@ -8,12 +8,16 @@ dashboards, and specialized input widgets.
 
 from .base_widget import BaseWidget
 from .client_widget import ClientWidget
+from .client_list_model import ClientListModel
+from .record_table_model import RecordTableModel
 from .diet_widget import DietWidget
 from .dashboard_widget import DashboardWidget
 
 __all__ = [
     'BaseWidget',
     'ClientWidget',
+    'ClientListModel',
+    'RecordTableModel',
     'DietWidget',
     'DashboardWidget'
 ]
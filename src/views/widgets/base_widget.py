@@ -6,7 +6,7 @@ in the Pharmacy Management App inherit from. It includes common functionality
 like theming, localization, validation, and signal handling.
 """
 
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Tuple
 from PyQt6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QGridLayout,
     QLabel, QPushButton, QLineEdit, QTextEdit,
@@ -29,6 +29,86 @@ from utils.resource_manager import ResourceManager
 from utils.validation import ValidationMixin
 
 
+# Base widget stylesheet; filled from the theme colors and font family with str.format
+WIDGET_STYLESHEET_TEMPLATE = """
+    QWidget {{
+        background-color: {background};
+        color: {text};
+        font-family: {font_family};
+        font-size: 10pt;
+    }}
+
+    QLineEdit, QTextEdit, QComboBox, QSpinBox, QDoubleSpinBox {{
+        background-color: {input_background};
+        border: 1px solid {border};
+        border-radius: 4px;
+        padding: 4px 8px;
+        min-height: 20px;
+    }}
+
+    QLineEdit:focus, QTextEdit:focus, QComboBox:focus {{
+        border: 2px solid {primary};
+    }}
+
+    QPushButton {{
+        background-color: {button_background};
+        border: 1px solid {border};
+        border-radius: 4px;
+        padding: 6px 12px;
+        min-height: 24px;
+        font-weight: 500;
+    }}
+
+    QPushButton:hover {{
+        background-color: {button_hover};
+    }}
+
+    QPushButton:pressed {{
+        background-color: {button_pressed};
+    }}
+
+    QPushButton:disabled {{
+        background-color: {disabled};
+        color: {disabled_text};
+    }}
+
+    QLabel.error {{
+        color: {error};
+        font-size: 9pt;
+        font-style: italic;
+    }}
+
+    QLabel.warning {{
+        color: {warning};
+        font-size: 9pt;
+        font-style: italic;
+    }}
+
+    QLabel.success {{
+        color: {success};
+        font-size: 9pt;
+        font-style: italic;
+    }}
+
+    QGroupBox {{
+        font-weight: bold;
+        border: 2px solid {border};
+        border-radius: 4px;
+        margin-top: 10px;
+        padding-top: 10px;
+    }}
+
+    QGroupBox::title {{
+        subcontrol-origin: margin;
+        left: 10px;
+        padding: 0 4px 0 4px;
+    }}
+"""
+
+# Formatted stylesheets by (theme, font family), shared by all widgets
+_stylesheet_cache: Dict[Tuple[str, str], str] = {}
+
+
 class BaseWidget(QWidget, ValidationMixin):
     """
     Base widget class providing common functionality for all custom widgets.
@@ -63,6 +143,7 @@ class BaseWidget(QWidget, ValidationMixin):
         self._validation_enabled = True
         self._auto_save_enabled = False
         self._animations_enabled = self.settings.get('ui.animations', True)
+        self._applied_stylesheet: Optional[str] = None
 
         # UI components
         self._main_layout = None
@@ -85,12 +166,7 @@ class BaseWidget(QWidget, ValidationMixin):
     def _setup_widget(self):
         """Initialize basic widget properties."""
         self.setObjectName(self.__class__.__name__)
-
-        # Set layout direction based on language
-        if self._is_rtl:
-            self.setLayoutDirection(Qt.LayoutDirection.RightToLeft)
-        else:
-            self.setLayoutDirection(Qt.LayoutDirection.LeftToRight)
+        # Layout direction is inherited from the application, set once at startup
 
     def _setup_layout(self):
         """Setup the main layout. Override in subclasses."""
@@ -100,83 +176,17 @@ class BaseWidget(QWidget, ValidationMixin):
 
     def _apply_theme(self):
         """Apply the current theme to the widget."""
-        theme_colors = self._get_theme_colors()
-
-        # Base styling
-        self.setStyleSheet(f"""
-            QWidget {{
-                background-color: {theme_colors['background']};
-                color: {theme_colors['text']};
-                font-family: {self._get_font_family()};
-                font-size: 10pt;
-            }}
-
-            QLineEdit, QTextEdit, QComboBox, QSpinBox, QDoubleSpinBox {{
-                background-color: {theme_colors['input_background']};
-                border: 1px solid {theme_colors['border']};
-                border-radius: 4px;
-                padding: 4px 8px;
-                min-height: 20px;
-            }}
-
-            QLineEdit:focus, QTextEdit:focus, QComboBox:focus {{
-                border: 2px solid {theme_colors['primary']};
-            }}
-
-            QPushButton {{
-                background-color: {theme_colors['button_background']};
-                border: 1px solid {theme_colors['border']};
-                border-radius: 4px;
-                padding: 6px 12px;
-                min-height: 24px;
-                font-weight: 500;
-            }}
-
-            QPushButton:hover {{
-                background-color: {theme_colors['button_hover']};
-            }}
-
-            QPushButton:pressed {{
-                background-color: {theme_colors['button_pressed']};
-            }}
-
-            QPushButton:disabled {{
-                background-color: {theme_colors['disabled']};
-                color: {theme_colors['disabled_text']};
-            }}
-
-            QLabel.error {{
-                color: {theme_colors['error']};
-                font-size: 9pt;
-                font-style: italic;
-            }}
-
-            QLabel.warning {{
-                color: {theme_colors['warning']};
-                font-size: 9pt;
-                font-style: italic;
-            }}
-
-            QLabel.success {{
-                color: {theme_colors['success']};
-                font-size: 9pt;
-                font-style: italic;
-            }}
-
-            QGroupBox {{
-                font-weight: bold;
-                border: 2px solid {theme_colors['border']};
-                border-radius: 4px;
-                margin-top: 10px;
-                padding-top: 10px;
-            }}
-
-            QGroupBox::title {{
-                subcontrol-origin: margin;
-                left: 10px;
-                padding: 0 4px 0 4px;
-            }}
-        """)
+        font_family = self._get_font_family()
+        key = (self._current_theme, font_family)
+        stylesheet = _stylesheet_cache.get(key)
+        if stylesheet is None:
+            stylesheet = WIDGET_STYLESHEET_TEMPLATE.format(font_family=font_family, **self._get_theme_colors())
+            _stylesheet_cache[key] = stylesheet
+
+        # Reassigning identical text would still make Qt re-parse it and repolish every child
+        if stylesheet != self._applied_stylesheet:
+            self._applied_stylesheet = stylesheet
+            self.setStyleSheet(stylesheet)
 
     def _get_theme_colors(self) -> Dict[str, str]:
         """Get color scheme for current theme."""
@@ -374,8 +384,9 @@ class BaseWidget(QWidget, ValidationMixin):
 
     def clear_all_fields(self):
         """Clear all field values."""
-        for field_name in self._field_widgets.keys():
-            widget = self._field_widgets[field_name]
+        # Signals are blocked so clearing does not fan out per-field change and validation handlers
+        for widget in self._field_widgets.values():
+            was_blocked = widget.blockSignals(True)
             if isinstance(widget, (QLineEdit, QTextEdit)):
                 widget.clear()
             elif isinstance(widget, QComboBox):
@@ -384,6 +395,10 @@ class BaseWidget(QWidget, ValidationMixin):
                 widget.setValue(0)
             elif isinstance(widget, QCheckBox):
                 widget.setChecked(False)
+            widget.blockSignals(was_blocked)
+
+        # Drop validation queued by edits made before the clear
+        self._validation_timer.stop()
 
     def _schedule_validation(self):
         """Schedule validation to occur after a brief delay."""
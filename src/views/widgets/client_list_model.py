@@ -0,0 +1,91 @@
+"""
+Client List Model Module
+
+This module provides the ClientListModel class, a read-only table model
+backing client selection views. Rows are plain tuples fetched a page at a
+time, so large client lists neither allocate a widget item per cell nor
+load the whole table up front.
+"""
+
+from typing import Optional, List, Tuple, Any, Callable
+from PyQt6.QtCore import QAbstractTableModel, QModelIndex, Qt
+
+
+# (id of the last loaded row or None, limit) -> rows ordered by id
+PageFetcher = Callable[[Optional[int], int], List[Tuple[int, str, str]]]
+
+
+class ClientListModel(QAbstractTableModel):
+    """
+    Table model exposing (pharmacy ID, name) columns for clients.
+
+    Each row is stored as an (id, client_pharmacy_id, client_name) tuple;
+    the database id is kept for selection but not displayed. Views pull
+    further pages through canFetchMore/fetchMore as they scroll.
+    """
+
+    COLUMN_COUNT = 2
+    PAGE_SIZE = 200
+
+    def __init__(self, is_rtl: bool = True, parent=None):
+        super().__init__(parent)
+        self._rows: List[Tuple[int, str, str]] = []
+        self._total = 0
+        self._fetch_page: Optional[PageFetcher] = None
+        self._headers = ("رقم العميل", "اسم العميل") if is_rtl else ("Client ID", "Client Name")
+
+    def set_source(self, total: int, fetch_page: PageFetcher):
+        """Reset the model to a new query and load its first page."""
+        self.beginResetModel()
+        self._total = total
+        self._fetch_page = fetch_page
+        self._rows = fetch_page(None, self.PAGE_SIZE) if total else []
+        self.endResetModel()
+
+    def client_id_at(self, row: int) -> Optional[int]:
+        """Get the database id for a row."""
+        if 0 <= row < len(self._rows):
+            return self._rows[row][0]
+        return None
+
+    def canFetchMore(self, parent: QModelIndex = QModelIndex()) -> bool:
+        if parent.isValid() or self._fetch_page is None:
+            return False
+        return len(self._rows) < self._total
+
+    def fetchMore(self, parent: QModelIndex = QModelIndex()):
+        if not self.canFetchMore(parent):
+            return
+
+        # The first page can come back empty (e.g. on a query error) while the count was non-zero
+        after_id = self._rows[-1][0] if self._rows else None
+        page = self._fetch_page(after_id, self.PAGE_SIZE)
+        if not page:
+            # Rows were removed since the count was taken
+            self._total = len(self._rows)
+            return
+
+        start = len(self._rows)
+        self.beginInsertRows(QModelIndex(), start, start + len(page) - 1)
+        self._rows.extend(page)
+        self.endInsertRows()
+
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else self.COLUMN_COUNT
+
+    def data(self, index: QModelIndex, role: int = Qt.ItemDataRole.DisplayRole) -> Any:
+        # Only the display role is served so views skip font/color/size lookups
+        if role != Qt.ItemDataRole.DisplayRole or not index.isValid():
+            return None
+        return str(self._rows[index.row()][index.column() + 1])
+
+    def headerData(self, section: int, orientation: Qt.Orientation,
+                   role: int = Qt.ItemDataRole.DisplayRole) -> Any:
+        if role != Qt.ItemDataRole.DisplayRole:
+            return None
+        if orientation == Qt.Orientation.Horizontal:
+            return self._headers[section]
+        return section + 1
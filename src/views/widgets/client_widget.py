@@ -13,16 +13,19 @@ from PyQt6.QtWidgets import (
     QComboBox, QSpinBox, QDoubleSpinBox,
     QCheckBox, QDateEdit, QGroupBox,
     QTabWidget, QScrollArea, QFrame,
-    QTableWidget, QTableWidgetItem,
-    QHeaderView, QMessageBox, QProgressBar
+    QTableWidget, QTableWidgetItem, QTableView,
+    QAbstractItemView, QHeaderView, QMessageBox, QProgressBar,
+    QCompleter, QFileDialog
 )
 from PyQt6.QtCore import (
     pyqtSignal, QDate, Qt, QTimer,
-    QThread, QObject
+    QThread, QObject, QStringListModel
 )
 from PyQt6.QtGui import QPixmap, QFont
 
 from .base_widget import BaseWidget
+from .client_list_model import ClientListModel
+from .record_table_model import RecordTableModel
 from controllers.client import ClientController
 from utils.validation import ClientValidation
 from models.client import Client, Gender, BloodType, ActivityLevel
@@ -47,6 +50,34 @@ class ClientWidget(BaseWidget):
     client_deleted = pyqtSignal(int)   # client_id
     bmi_calculated = pyqtSignal(float, str)  # bmi_value, category
 
+    # Autocomplete lookup: debounce delay after typing and maximum clients suggested
+    COMPLETER_DELAY_MS = 150
+    COMPLETER_LIMIT = 20
+
+    # Debounce delay before the client list is re-queried for the search text
+    SEARCH_DELAY_MS = 200
+
+    # Form field tables, grouped in tab order:
+    # (attribute, field name, Arabic label, English label, widget class, row, column, column span, max height)
+    NAME_FIELDS = (
+        ("first_name_edit", "first_name", "الاسم الأول:", "First Name:", QLineEdit, 0, 0, 1, 0),
+        ("last_name_edit", "last_name", "اسم العائلة:", "Last Name:", QLineEdit, 0, 2, 1, 0),
+    )
+    IDENTITY_FIELDS = (
+        ("id_number_edit", "id_number", "رقم الهوية:", "ID Number:", QLineEdit, 2, 0, 1, 0),
+        ("occupation_edit", "occupation", "المهنة:", "Occupation:", QLineEdit, 2, 2, 1, 0),
+    )
+    CONTACT_FIELDS = (
+        ("phone_edit", "phone", "رقم الهاتف:", "Phone:", QLineEdit, 0, 0, 1, 0),
+        ("email_edit", "email", "البريد الإلكتروني:", "Email:", QLineEdit, 0, 2, 1, 0),
+        ("address_edit", "address", "العنوان:", "Address:", QTextEdit, 1, 0, 3, 80),
+    )
+    MEDICAL_TEXT_FIELDS = (
+        ("medical_conditions_edit", "medical_conditions", "الحالات الطبية:", "Medical Conditions:", QTextEdit, 1, 0, 3, 60),
+        ("medications_edit", "medications", "الأدوية:", "Medications:", QTextEdit, 2, 0, 3, 60),
+        ("allergies_edit", "allergies", "الحساسية:", "Allergies:", QTextEdit, 3, 0, 3, 60),
+    )
+
     def __init__(self, parent: Optional[QWidget] = None):
         super().__init__(parent)
 
@@ -64,7 +95,15 @@ class ClientWidget(BaseWidget):
         self.client_form = None
         self.medical_form = None
         self.history_table = None
+        self.history_model = None
+        self.client_list_view = None
+        self.client_list_model = None
         self.search_widget = None
+        self.search_completer_model = None
+        self.search_completer = None
+        self._completer_timer = None
+        self._search_timer = None
+        self._export_dialog: Optional[QFileDialog] = None
 
         # Form fields
         self.form_fields = {}
@@ -85,10 +124,14 @@ class ClientWidget(BaseWidget):
         header_layout = self._create_header()
         main_layout.addLayout(header_layout)
 
-        # Tab widget for different views
+        # Tab widget for different views; repaint once after all tabs are built
+        self.setUpdatesEnabled(False)
         self.tab_widget = QTabWidget()
         main_layout.addWidget(self.tab_widget)
 
+        # Client List Tab
+        self._create_client_list_tab()
+
         # Client Information Tab
         self._create_client_info_tab()
 
@@ -101,6 +144,8 @@ class ClientWidget(BaseWidget):
         # Statistics Tab
         self._create_statistics_tab()
 
+        self.setUpdatesEnabled(True)
+
     def _create_header(self) -> QHBoxLayout:
         """Create the header with search and action buttons."""
         layout = QHBoxLayout()
@@ -112,7 +157,25 @@ class ClientWidget(BaseWidget):
             "اسم العميل، رقم الهاتف، أو المعرف" if self._is_rtl
             else "Client name, phone, or ID"
         )
-        self.search_edit.textChanged.connect(self._on_search_changed)
+        # Reload the client list once typing pauses rather than on every keystroke
+        self._search_timer = QTimer(self)
+        self._search_timer.setSingleShot(True)
+        self._search_timer.setInterval(self.SEARCH_DELAY_MS)
+        self._search_timer.timeout.connect(lambda: self._on_search_changed(self.search_edit.text()))
+        self.search_edit.textChanged.connect(lambda _: self._search_timer.start())
+
+        # Autocomplete over client names and pharmacy IDs, queried per edit with a small LIMIT
+        self.search_completer_model = QStringListModel(self)
+        self.search_completer = QCompleter(self.search_completer_model, self)
+        self.search_completer.setCaseSensitivity(Qt.CaseSensitivity.CaseInsensitive)
+        self.search_completer.setFilterMode(Qt.MatchFlag.MatchContains)
+        self.search_edit.setCompleter(self.search_completer)
+
+        self._completer_timer = QTimer(self)
+        self._completer_timer.setSingleShot(True)
+        self._completer_timer.setInterval(self.COMPLETER_DELAY_MS)
+        self._completer_timer.timeout.connect(self._refresh_search_completer)
+        self.search_edit.textEdited.connect(lambda _: self._completer_timer.start())
 
         # Action buttons
         self.new_client_btn = QPushButton("عميل جديد" if self._is_rtl else "New Client")
@@ -140,6 +203,48 @@ class ClientWidget(BaseWidget):
 
         return layout
 
+    def _refresh_search_completer(self):
+        """Load autocomplete entries matching the current search text."""
+        text = self.search_edit.text().strip()
+        self.search_completer_model.setStringList(
+            self.client_controller.get_client_search_terms(text, self.COMPLETER_LIMIT)
+        )
+        if text and self.search_edit.hasFocus():
+            self.search_completer.complete()
+
+    def _create_client_list_tab(self):
+        """Create the client list tab backed by a lazy table model."""
+        widget = QWidget()
+        layout = QVBoxLayout(widget)
+
+        self.client_list_model = ClientListModel(self._is_rtl, self)
+        self.client_list_view = QTableView()
+        self.client_list_view.setModel(self.client_list_model)
+        self.client_list_view.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self.client_list_view.setSelectionMode(QAbstractItemView.SelectionMode.SingleSelection)
+        self.client_list_view.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.client_list_view.horizontalHeader().setStretchLastSection(True)
+        self.client_list_view.doubleClicked.connect(self._on_client_list_activated)
+        layout.addWidget(self.client_list_view)
+
+        self.tab_widget.addTab(widget, "العملاء" if self._is_rtl else "Clients")
+        self._load_client_list()
+
+    def _load_client_list(self, search_term: Optional[str] = None):
+        """Reload the client list model."""
+        controller = self.client_controller
+        self.client_list_model.set_source(
+            controller.count_client_summaries(search_term),
+            lambda after_id, limit: controller.get_client_summaries(search_term, after_id, limit)
+        )
+
+    def _on_client_list_activated(self, index):
+        """Load the client for the activated list row."""
+        client_id = self.client_list_model.client_id_at(index.row())
+        if client_id is not None:
+            self.load_client(client_id)
+            self.tab_widget.setCurrentIndex(1)
+
     def _create_client_info_tab(self):
         """Create the main client information tab."""
         scroll_area = QScrollArea()
@@ -169,21 +274,24 @@ class ClientWidget(BaseWidget):
         scroll_area.setWidget(main_widget)
         self.tab_widget.addTab(scroll_area, "معلومات العميل" if self._is_rtl else "Client Info")
 
+    def _add_form_fields(self, layout: QGridLayout, fields: tuple):
+        """Create, place and register labelled form widgets from a field table."""
+        for attr_name, field_name, label_ar, label_en, widget_cls, row, column, span, max_height in fields:
+            layout.addWidget(QLabel(label_ar if self._is_rtl else label_en), row, column)
+            widget = widget_cls()
+            if max_height:
+                widget.setMaximumHeight(max_height)
+            layout.addWidget(widget, row, column + 1, 1, span)
+            setattr(self, attr_name, widget)
+            self.add_field_widget(field_name, widget)
+
     def _create_personal_info_group(self) -> QGroupBox:
         """Create personal information form group."""
         group = QGroupBox("المعلومات الشخصية" if self._is_rtl else "Personal Information")
         layout = QGridLayout(group)
 
         # Name fields
-        layout.addWidget(QLabel("الاسم الأول:" if self._is_rtl else "First Name:"), 0, 0)
-        self.first_name_edit = QLineEdit()
-        layout.addWidget(self.first_name_edit, 0, 1)
-        self.add_field_widget("first_name", self.first_name_edit)
-
-        layout.addWidget(QLabel("اسم العائلة:" if self._is_rtl else "Last Name:"), 0, 2)
-        self.last_name_edit = QLineEdit()
-        layout.addWidget(self.last_name_edit, 0, 3)
-        self.add_field_widget("last_name", self.last_name_edit)
+        self._add_form_fields(layout, self.NAME_FIELDS)
 
         # Date of birth
         layout.addWidget(QLabel("تاريخ الميلاد:" if self._is_rtl else "Date of Birth:"), 1, 0)
@@ -202,17 +310,8 @@ class ClientWidget(BaseWidget):
         layout.addWidget(self.gender_combo, 1, 3)
         self.add_field_widget("gender", self.gender_combo)
 
-        # ID Number
-        layout.addWidget(QLabel("رقم الهوية:" if self._is_rtl else "ID Number:"), 2, 0)
-        self.id_number_edit = QLineEdit()
-        layout.addWidget(self.id_number_edit, 2, 1)
-        self.add_field_widget("id_number", self.id_number_edit)
-
-        # Occupation
-        layout.addWidget(QLabel("المهنة:" if self._is_rtl else "Occupation:"), 2, 2)
-        self.occupation_edit = QLineEdit()
-        layout.addWidget(self.occupation_edit, 2, 3)
-        self.add_field_widget("occupation", self.occupation_edit)
+        # ID number and occupation
+        self._add_form_fields(layout, self.IDENTITY_FIELDS)
 
         return group
 
@@ -221,24 +320,8 @@ class ClientWidget(BaseWidget):
         group = QGroupBox("معلومات الاتصال" if self._is_rtl else "Contact Information")
         layout = QGridLayout(group)
 
-        # Phone
-        layout.addWidget(QLabel("رقم الهاتف:" if self._is_rtl else "Phone:"), 0, 0)
-        self.phone_edit = QLineEdit()
-        layout.addWidget(self.phone_edit, 0, 1)
-        self.add_field_widget("phone", self.phone_edit)
-
-        # Email
-        layout.addWidget(QLabel("البريد الإلكتروني:" if self._is_rtl else "Email:"), 0, 2)
-        self.email_edit = QLineEdit()
-        layout.addWidget(self.email_edit, 0, 3)
-        self.add_field_widget("email", self.email_edit)
-
-        # Address
-        layout.addWidget(QLabel("العنوان:" if self._is_rtl else "Address:"), 1, 0)
-        self.address_edit = QTextEdit()
-        self.address_edit.setMaximumHeight(80)
-        layout.addWidget(self.address_edit, 1, 1, 1, 3)
-        self.add_field_widget("address", self.address_edit)
+        # Phone, email and address
+        self._add_form_fields(layout, self.CONTACT_FIELDS)
 
         return group
 
@@ -269,26 +352,8 @@ class ClientWidget(BaseWidget):
         layout.addWidget(self.activity_combo, 0, 3)
         self.add_field_widget("activity_level", self.activity_combo)
 
-        # Medical Conditions
-        layout.addWidget(QLabel("الحالات الطبية:" if self._is_rtl else "Medical Conditions:"), 1, 0)
-        self.medical_conditions_edit = QTextEdit()
-        self.medical_conditions_edit.setMaximumHeight(60)
-        layout.addWidget(self.medical_conditions_edit, 1, 1, 1, 3)
-        self.add_field_widget("medical_conditions", self.medical_conditions_edit)
-
-        # Medications
-        layout.addWidget(QLabel("الأدوية:" if self._is_rtl else "Medications:"), 2, 0)
-        self.medications_edit = QTextEdit()
-        self.medications_edit.setMaximumHeight(60)
-        layout.addWidget(self.medications_edit, 2, 1, 1, 3)
-        self.add_field_widget("medications", self.medications_edit)
-
-        # Allergies
-        layout.addWidget(QLabel("الحساسية:" if self._is_rtl else "Allergies:"), 3, 0)
-        self.allergies_edit = QTextEdit()
-        self.allergies_edit.setMaximumHeight(60)
-        layout.addWidget(self.allergies_edit, 3, 1, 1, 3)
-        self.add_field_widget("allergies", self.allergies_edit)
+        # Medical conditions, medications and allergies
+        self._add_form_fields(layout, self.MEDICAL_TEXT_FIELDS)
 
         return group
 
@@ -346,11 +411,14 @@ class ClientWidget(BaseWidget):
 
         layout.addLayout(header_layout)
 
-        # History table
-        self.history_table = QTableWidget()
-        self.history_table.setColumnCount(4)
+        # History table: a view over plain rows, so only visible cells are painted
         headers = ["التاريخ", "النوع", "الوصف", "الملاحظات"] if self._is_rtl else ["Date", "Type", "Description", "Notes"]
-        self.history_table.setHorizontalHeaderLabels(headers)
+        self.history_model = RecordTableModel(headers, self)
+        self.history_table = QTableView()
+        self.history_table.setModel(self.history_model)
+        self.history_table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.history_table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self.history_table.verticalHeader().setDefaultSectionSize(24)
         self.history_table.horizontalHeader().setStretchLastSection(True)
         layout.addWidget(self.history_table)
 
@@ -473,8 +541,7 @@ class ClientWidget(BaseWidget):
 
     def _on_search_changed(self, text: str):
         """Handle search text changes."""
-        # TODO: Implement client search
-        pass
+        self._load_client_list(text.strip() or None)
 
     def _new_client(self):
         """Create a new client."""
@@ -482,8 +549,11 @@ class ClientWidget(BaseWidget):
         self._is_editing = True
         self.clear_all_fields()
         self.clear_all_errors()
+        self.history_model.set_rows([])
         self.save_btn.setEnabled(True)
         self.delete_btn.setEnabled(False)
+        # The client list tab is the default page; show the form being filled
+        self.tab_widget.setCurrentIndex(1)
 
     def _save_client(self):
         """Save the current client."""
@@ -533,8 +603,19 @@ class ClientWidget(BaseWidget):
 
     def _export_client_data(self):
         """Export client data."""
-        # TODO: Implement data export
-        pass
+        # One dialog is kept for the widget's lifetime; the platform file picker is
+        # expensive to bring up the first time and remembers the last folder this way
+        if self._export_dialog is None:
+            self._export_dialog = QFileDialog(
+                self, "تصدير بيانات العملاء" if self._is_rtl else "Export Client Data"
+            )
+            self._export_dialog.setAcceptMode(QFileDialog.AcceptMode.AcceptSave)
+            self._export_dialog.setNameFilter("CSV (*.csv)")
+            self._export_dialog.setDefaultSuffix("csv")
+
+        self._export_dialog.selectFile("clients.csv")
+        if self._export_dialog.exec() and self._export_dialog.selectedFiles():
+            self.client_controller.export_clients_csv(self._export_dialog.selectedFiles()[0])
 
     def _calculate_bmi(self):
         """Calculate and display BMI."""
@@ -584,15 +665,15 @@ class ClientWidget(BaseWidget):
             'id_number': self.id_number_edit.text(),
             'phone': self.phone_edit.text(),
             'email': self.email_edit.text(),
-            'address': self.address_edit.toPlainText(),
+            'address': self.address_edit.toPlainText().strip(),
             'occupation': self.occupation_edit.text(),
             'blood_type': self.blood_type_combo.currentText(),
             'activity_level': self._get_activity_level(),
             'height': self.height_spin.value(),
             'weight': self.weight_spin.value(),
-            'medical_conditions': self.medical_conditions_edit.toPlainText(),
-            'medications': self.medications_edit.toPlainText(),
-            'allergies': self.allergies_edit.toPlainText()
+            'medical_conditions': self.medical_conditions_edit.toPlainText().strip(),
+            'medications': self.medications_edit.toPlainText().strip(),
+            'allergies': self.allergies_edit.toPlainText().strip()
         }
 
     def _get_activity_level(self) -> ActivityLevel:
@@ -611,7 +692,8 @@ class ClientWidget(BaseWidget):
         """Set form fields from client data."""
         self.first_name_edit.setText(client.first_name)
         self.last_name_edit.setText(client.last_name)
-        self.birth_date_edit.setDate(QDate.fromString(client.birth_date.isoformat(), Qt.DateFormat.ISODate))
+        birth_date = client.birth_date
+        self.birth_date_edit.setDate(QDate(birth_date.year, birth_date.month, birth_date.day))
         self.gender_combo.setCurrentIndex(0 if client.gender == Gender.MALE else 1)
         self.id_number_edit.setText(client.id_number or "")
         self.phone_edit.setText(client.phone or "")
@@ -687,10 +769,11 @@ class ClientWidget(BaseWidget):
     def load_client(self, client_id: int):
         """Load a specific client."""
         try:
-            client = self.client_controller.get_client(client_id)
+            client, note_rows = self.client_controller.get_client_with_note_rows(client_id)
             if client:
                 self.current_client = client
                 self._set_client_data(client)
+                self.history_model.set_rows(note_rows)
                 self._is_editing = False
                 self.save_btn.setEnabled(False)
                 self.delete_btn.setEnabled(True)
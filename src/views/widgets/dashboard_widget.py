@@ -6,7 +6,7 @@ of the pharmacy management system with key statistics, recent activities,
 and quick actions for efficient workflow management.
 """
 
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Tuple
 from datetime import datetime, date, timedelta
 from PyQt6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QGridLayout,
@@ -16,17 +16,38 @@ from PyQt6.QtWidgets import (
     QHeaderView, QSplitter, QTextEdit
 )
 from PyQt6.QtCore import (
-    pyqtSignal, Qt, QTimer, QThread, QObject
+    pyqtSignal, Qt, QTimer, QThread, QObject, QCoreApplication
 )
 from PyQt6.QtGui import QFont, QPixmap, QIcon, QColor
 
 from .base_widget import BaseWidget
-from controllers.client import ClientController
+from controllers.client import ClientController, FollowUpCheckThread
 from controllers.diet import DietController
 from controllers.report import ReportController
 from controllers.auth import AuthController
 
 
+# Today's summary text by language, filled with str.format_map
+SUMMARY_TEMPLATES = {
+    True: """ملخص اليوم - {date}
+
+عملاء جدد: {new_clients}
+مواعيد: {appointments}
+سجلات غذائية: {diet_records}
+
+الحالة: {status}
+""",
+    False: """Today's Summary - {date}
+
+New Clients: {new_clients}
+Appointments: {appointments}
+Diet Records: {diet_records}
+
+Status: {status}
+""",
+}
+
+
 class DashboardWidget(BaseWidget):
     """
     Main dashboard widget providing system overview and quick actions.
@@ -71,12 +92,18 @@ class DashboardWidget(BaseWidget):
         self.upcoming_appointments_list = None
         self.notifications_list = None
         self.quick_action_buttons = {}
+        self._follow_up_thread: Optional[FollowUpCheckThread] = None
 
         # Refresh timer
         self.refresh_timer = QTimer()
         self.refresh_timer.timeout.connect(self.refresh_data)
         self.refresh_timer.start(300000)  # Refresh every 5 minutes
 
+        # Let a running follow-up query finish before the application tears down
+        app = QCoreApplication.instance()
+        if app is not None:
+            app.aboutToQuit.connect(self.cleanup)
+
         self._setup_ui()
         self._connect_signals()
         self.refresh_data()
@@ -471,6 +498,8 @@ class DashboardWidget(BaseWidget):
         appointment_data = item.data(Qt.ItemDataRole.UserRole)
         if appointment_data and 'appointment_id' in appointment_data:
             self.appointment_selected.emit(appointment_data['appointment_id'])
+        elif appointment_data and 'client_id' in appointment_data:
+            self.client_selected.emit(appointment_data['client_id'])
 
     def _handle_notification_click(self, item: QListWidgetItem):
         """Handle notification item clicks."""
@@ -484,8 +513,6 @@ class DashboardWidget(BaseWidget):
     def _refresh_activities(self):
         """Refresh the recent activities list."""
         try:
-            self.recent_activities_list.clear()
-
             # Add placeholder activities for now
             activities = [
                 "مرحباً بنظام إدارة الصيدلية" if self._is_rtl else "Welcome to Pharmacy Management System",
@@ -493,13 +520,27 @@ class DashboardWidget(BaseWidget):
                 "يمكنك الآن إضافة العملاء" if self._is_rtl else "You can now add clients"
             ]
 
-            for activity_text in activities:
-                item = QListWidgetItem(activity_text)
-                self.recent_activities_list.addItem(item)
+            self._fill_list(self.recent_activities_list, [(text, None) for text in activities])
 
         except Exception as e:
             print(f"Activities refresh error: {str(e)}")  # Simple error logging
 
+    @staticmethod
+    def _fill_list(list_widget: QListWidget, rows: List[Tuple[str, Any]]):
+        """Show (text, user data) rows, reusing existing items instead of rebuilding the list."""
+        for row, (text, data) in enumerate(rows):
+            item = list_widget.item(row)
+            if item is None:
+                item = QListWidgetItem()
+                list_widget.addItem(item)
+            if item.text() != text:
+                item.setText(text)
+            item.setData(Qt.ItemDataRole.UserRole, data)
+
+        # Drop only the rows beyond the new count
+        while list_widget.count() > len(rows):
+            list_widget.takeItem(list_widget.count() - 1)
+
     def _clear_notifications(self):
         """Clear all notifications."""
         self.notifications_list.clear()
@@ -559,14 +600,41 @@ class DashboardWidget(BaseWidget):
             print(f"KPI update error: {str(e)}")  # Simple error logging
 
     def _update_appointments(self):
-        """Update upcoming appointments list."""
+        """Start loading upcoming follow-ups in the background."""
+        if self._follow_up_thread is not None and self._follow_up_thread.isRunning():
+            return
+
+        thread = FollowUpCheckThread(days_ahead=7)
+        thread.follow_ups_loaded.connect(self._on_follow_ups_loaded)
+        # Drop the reference before deleteLater destroys the thread, so the next refresh starts a new one
+        thread.finished.connect(self._on_follow_up_thread_finished)
+        thread.finished.connect(thread.deleteLater)
+        self._follow_up_thread = thread
+        thread.start()
+
+    def _on_follow_up_thread_finished(self):
+        """Forget the finished follow-up thread."""
+        self._follow_up_thread = None
+
+    def cleanup(self):
+        """Stop refreshing and wait for a running follow-up query to finish."""
+        self.refresh_timer.stop()
+        if self._follow_up_thread is not None:
+            self._follow_up_thread.wait()
+            self._follow_up_thread = None
+
+    def _on_follow_ups_loaded(self, follow_ups: List[tuple]):
+        """Fill the appointments list once the follow-up query returns."""
         try:
-            self.upcoming_appointments_list.clear()
+            if not follow_ups:
+                placeholder_text = "لا توجد مواعيد مجدولة" if self._is_rtl else "No scheduled appointments"
+                self._fill_list(self.upcoming_appointments_list, [(placeholder_text, None)])
+                return
 
-            # Add placeholder text for appointments
-            placeholder_text = "لا توجد مواعيد مجدولة" if self._is_rtl else "No scheduled appointments"
-            item = QListWidgetItem(placeholder_text)
-            self.upcoming_appointments_list.addItem(item)
+            self._fill_list(self.upcoming_appointments_list, [
+                (f"{client_name} - {follow_up_date}", {'client_id': client_id})
+                for client_id, client_name, follow_up_date in follow_ups
+            ])
 
         except Exception as e:
             print(f"Appointments update error: {str(e)}")  # Simple error logging
@@ -574,12 +642,9 @@ class DashboardWidget(BaseWidget):
     def _update_notifications(self):
         """Update system notifications."""
         try:
-            self.notifications_list.clear()
-
             # Add welcome notification
             welcome_text = "مرحباً! النظام جاهز للاستخدام" if self._is_rtl else "Welcome! System is ready to use"
-            item = QListWidgetItem(welcome_text)
-            self.notifications_list.addItem(item)
+            self._fill_list(self.notifications_list, [(welcome_text, None)])
 
         except Exception as e:
             print(f"Notifications update error: {str(e)}")  # Simple error logging
@@ -590,24 +655,13 @@ class DashboardWidget(BaseWidget):
             today = date.today()
 
             # Create simple summary with placeholder data
-            if self._is_rtl:
-                summary = f"""ملخص اليوم - {today.strftime('%d/%m/%Y')}
-
-عملاء جدد: 0
-مواعيد: 0
-سجلات غذائية: 0
-
-الحالة: النظام يعمل بشكل طبيعي
-"""
-            else:
-                summary = f"""Today's Summary - {today.strftime('%m/%d/%Y')}
-
-New Clients: 0
-Appointments: 0
-Diet Records: 0
-
-Status: System operating normally
-"""
+            summary = SUMMARY_TEMPLATES[self._is_rtl].format_map({
+                'date': today.strftime('%d/%m/%Y' if self._is_rtl else '%m/%d/%Y'),
+                'new_clients': 0,
+                'appointments': 0,
+                'diet_records': 0,
+                'status': "النظام يعمل بشكل طبيعي" if self._is_rtl else "System operating normally",
+            })
 
             self.summary_text.setPlainText(summary)
 
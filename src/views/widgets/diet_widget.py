@@ -5,8 +5,10 @@ This module provides the DietWidget class for managing diet records,
 meal planning, nutrition tracking, and dietary recommendations.
 """
 
+import bisect
+import math
 from typing import Optional, Dict, Any, List
-from datetime import datetime, date, timedelta
+from datetime import datetime, date
 from PyQt6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QGridLayout,
     QLabel, QPushButton, QLineEdit, QTextEdit,
@@ -30,6 +32,25 @@ from utils.validation import NutritionValidation
 from models.diet import DietRecord, MealType, DietGoal
 
 
+# Progress bar colors by percentage of target: below 50, below 80, up to 110 inclusive, above 110
+PROGRESS_THRESHOLDS = (50.0, 80.0, math.nextafter(110.0, math.inf))
+PROGRESS_STYLESHEETS = tuple(
+    f"QProgressBar::chunk {{ background-color: {color}; }}"
+    for color in ("#ff6b6b", "#ffa726", "#4caf50", "#ff9800")
+)
+
+# Meal list entry text, "name - quantity g"; _parse_food_items reads it back
+format_food_item = "{} - {}g".format
+
+# MealPlan column holding each meal list's items
+MEAL_PLAN_COLUMNS = {
+    'breakfast': 'breakfast',
+    'lunch': 'lunch',
+    'dinner': 'dinner',
+    'snacks': 'afternoon_snack'
+}
+
+
 class DietWidget(BaseWidget):
     """
     Widget for managing diet records and nutrition tracking.
@@ -62,6 +83,7 @@ class DietWidget(BaseWidget):
         self.current_client_id: Optional[int] = None
         self.current_date = date.today()
         self.current_diet_record: Optional[DietRecord] = None
+        self._connected_save_thread = None
 
         # UI components
         self.tab_widget = None
@@ -607,15 +629,14 @@ class DietWidget(BaseWidget):
         # Clear existing meals
         self._clear_all_meals()
 
-        # Add meals from record
+        # Add meals from record, one addItems call per list so each relayouts once
         for meal in diet_record.meals:
             meal_type = meal.meal_type.value.lower()
             if meal_type in self.meal_widgets:
                 meal_list = getattr(self.meal_widgets[meal_type], 'meal_list')
-
-                for food_item in meal.food_items:
-                    item_text = f"{food_item.name} - {food_item.quantity}g"
-                    meal_list.addItem(QListWidgetItem(item_text))
+                meal_list.addItems([
+                    format_food_item(food_item.name, food_item.quantity) for food_item in meal.food_items
+                ])
 
         # Update water intake
         if hasattr(diet_record, 'water_intake'):
@@ -660,16 +681,11 @@ class DietWidget(BaseWidget):
         value_label.setText(f"{current_value:.1f} / {target} {unit}")
         progress_bar.setValue(int(current_value))
 
-        # Color coding based on percentage
+        # Color coding based on percentage; only restyle when the band changes
         percentage = (current_value / target) * 100
-        if percentage < 50:
-            progress_bar.setStyleSheet("QProgressBar::chunk { background-color: #ff6b6b; }")
-        elif percentage < 80:
-            progress_bar.setStyleSheet("QProgressBar::chunk { background-color: #ffa726; }")
-        elif percentage <= 110:
-            progress_bar.setStyleSheet("QProgressBar::chunk { background-color: #4caf50; }")
-        else:
-            progress_bar.setStyleSheet("QProgressBar::chunk { background-color: #ff9800; }")
+        stylesheet = PROGRESS_STYLESHEETS[bisect.bisect_right(PROGRESS_THRESHOLDS, percentage)]
+        if progress_bar.styleSheet() != stylesheet:
+            progress_bar.setStyleSheet(stylesheet)
 
     def _update_water_display(self, glasses: int):
         """Update water intake display."""
@@ -677,15 +693,11 @@ class DietWidget(BaseWidget):
 
     def _previous_day(self):
         """Navigate to previous day."""
-        current_date = self.date_edit.date().toPython()
-        previous_date = current_date - timedelta(days=1)
-        self.date_edit.setDate(QDate.fromString(previous_date.isoformat(), Qt.DateFormat.ISODate))
+        self.date_edit.setDate(self.date_edit.date().addDays(-1))
 
     def _next_day(self):
         """Navigate to next day."""
-        current_date = self.date_edit.date().toPython()
-        next_date = current_date + timedelta(days=1)
-        self.date_edit.setDate(QDate.fromString(next_date.isoformat(), Qt.DateFormat.ISODate))
+        self.date_edit.setDate(self.date_edit.date().addDays(1))
 
     def _go_to_today(self):
         """Navigate to today."""
@@ -708,7 +720,7 @@ class DietWidget(BaseWidget):
             return
 
         quantity = quantity_input.value()
-        item_text = f"{food_name} - {quantity}g"
+        item_text = format_food_item(food_name, quantity)
 
         meal_list.addItem(QListWidgetItem(item_text))
         food_input.clear()
@@ -739,42 +751,7 @@ class DietWidget(BaseWidget):
             return
 
         try:
-            # Collect all meal data
-            all_meals = []
-            for meal_type, meal_widget in self.meal_widgets.items():
-                meal_list = getattr(meal_widget, 'meal_list')
-
-                food_items = []
-                for i in range(meal_list.count()):
-                    item_text = meal_list.item(i).text()
-                    # Parse item text to get name and quantity
-                    parts = item_text.split(' - ')
-                    if len(parts) == 2:
-                        name = parts[0]
-                        quantity_str = parts[1].replace('g', '')
-                        try:
-                            quantity = float(quantity_str)
-                            food_items.append({
-                                'name': name,
-                                'quantity': quantity
-                            })
-                        except ValueError:
-                            continue
-
-                if food_items:
-                    all_meals.append({
-                        'meal_type': meal_type.upper(),
-                        'food_items': food_items
-                    })
-
-            # Save diet record
-            diet_data = {
-                'client_id': self.current_client_id,
-                'date': self.current_date,
-                'meals': all_meals,
-                'water_intake': self.water_slider.value(),
-                'notes': ""
-            }
+            diet_data = self._collect_diet_data()
 
             if self.current_diet_record:
                 # Update existing record
@@ -792,6 +769,64 @@ class DietWidget(BaseWidget):
         except Exception as e:
             self.show_error(f"خطأ في حفظ السجل: {str(e)}" if self._is_rtl else f"Error saving record: {str(e)}")
 
+    def _collect_diet_data(self) -> Dict[str, Any]:
+        """Collect the current meals and water intake into diet record data."""
+        all_meals = []
+        for meal_type, meal_widget in self.meal_widgets.items():
+            food_items = self._parse_food_items(getattr(meal_widget, 'meal_list'))
+
+            if food_items:
+                all_meals.append({
+                    'meal_type': meal_type.upper(),
+                    'food_items': food_items
+                })
+
+        return {
+            'client_id': self.current_client_id,
+            'date': self.current_date,
+            'meals': all_meals,
+            'water_intake': self.water_slider.value(),
+            'notes': ""
+        }
+
+    def save_data(self) -> bool:
+        """Queue an autosave of the day's meals and water intake on the background save thread."""
+        if not self.current_client_id:
+            return True
+
+        # One MealPlan text column per meal list, one "name - quantity g" line per item
+        meals = {}
+        for meal_type, meal_widget in self.meal_widgets.items():
+            meal_list = getattr(meal_widget, 'meal_list')
+            meals[MEAL_PLAN_COLUMNS[meal_type]] = "\n".join(
+                meal_list.item(i).text() for i in range(meal_list.count())
+            )
+        # MealPlan has no water column, so the intake is kept in the plan's notes
+        notes = f"Water intake: {self.water_slider.value()} glasses"
+        save_thread = self.diet_controller.save_day_plan_async(self.current_client_id, self.current_date, meals, notes)
+        if save_thread is not self._connected_save_thread:
+            save_thread.save_failed.connect(self._on_day_plan_save_failed)
+            self._connected_save_thread = save_thread
+        return True
+
+    def _on_day_plan_save_failed(self, message: str):
+        """Tell the user a background meal plan save did not go through."""
+        self.show_error(f"خطأ في حفظ خطة الوجبات: {message}" if self._is_rtl else f"Error saving meal plan: {message}")
+
+    @staticmethod
+    def _parse_food_items(meal_list: QListWidget) -> List[Dict[str, Any]]:
+        """Parse "name - quantity g" meal list entries into food item dicts."""
+        food_items = []
+        for i in range(meal_list.count()):
+            name, separator, quantity_text = meal_list.item(i).text().rpartition(' - ')
+            if not separator:
+                continue
+            try:
+                food_items.append({'name': name, 'quantity': float(quantity_text.rstrip('g'))})
+            except ValueError:
+                continue
+        return food_items
+
     def _copy_from_day(self):
         """Copy meals from another day."""
         # TODO: Implement copy from day dialog
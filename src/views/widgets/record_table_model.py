@@ -0,0 +1,49 @@
+"""
+Record Table Model Module
+
+This module provides the RecordTableModel class, a read-only table model
+for short database histories. Views paint only the visible rows from a
+list of plain tuples instead of holding a widget item per cell.
+"""
+
+from typing import List, Tuple, Sequence, Any
+from PyQt6.QtCore import QAbstractTableModel, QModelIndex, Qt
+
+
+class RecordTableModel(QAbstractTableModel):
+    """
+    Table model exposing a list of tuples, one per row.
+
+    Cells are converted to text when painted; None is shown as an empty cell.
+    """
+
+    def __init__(self, headers: Sequence[str], parent=None):
+        super().__init__(parent)
+        self._headers = tuple(headers)
+        self._rows: List[Tuple] = []
+
+    def set_rows(self, rows: List[Tuple]):
+        """Replace all rows in a single model reset."""
+        self.beginResetModel()
+        self._rows = rows
+        self.endResetModel()
+
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._headers)
+
+    def data(self, index: QModelIndex, role: int = Qt.ItemDataRole.DisplayRole) -> Any:
+        if role != Qt.ItemDataRole.DisplayRole or not index.isValid():
+            return None
+        value = self._rows[index.row()][index.column()]
+        return "" if value is None else str(value)
+
+    def headerData(self, section: int, orientation: Qt.Orientation,
+                   role: int = Qt.ItemDataRole.DisplayRole) -> Any:
+        if role != Qt.ItemDataRole.DisplayRole:
+            return None
+        if orientation == Qt.Orientation.Horizontal:
+            return self._headers[section]
+        return section + 1